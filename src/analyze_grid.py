@@ -22,7 +22,11 @@ def analyze_grid() -> pd.DataFrame:
     # 3. 根據市值排名過濾市場
     filtered_markets = filter_by_market_cap_rank(markets, market_caps, max_rank=500)
     
-    # 4. 分析每個市場
+    # 4. 一次並行獲取所有市場的 OHLCV 數據，增加獲取的數據點以確保有足夠的歷史數據
+    symbols = [market.symbol for market in filtered_markets]
+    ohlcv_1d_by_symbol = binance_client.fetch_ohlcv_batch(symbols, BinanceTimeframe.DAY_1, limit=300)
+    
+    # 分析每個市場
     results = []
     for market in tqdm(
         filtered_markets,
@@ -31,11 +35,10 @@ def analyze_grid() -> pd.DataFrame:
         colour="blue",
     ):
         try:
-            ohlcv_1d = binance_client.fetch_ohlcv(
-                market.symbol,
-                BinanceTimeframe.DAY_1,
-                limit=300,  # 增加數據點以確保有足夠的歷史數據
-            )
+            ohlcv_1d = ohlcv_1d_by_symbol[market.symbol]
+            # 獲取失敗的市場對應的是例外
+            if isinstance(ohlcv_1d, Exception):
+                raise ohlcv_1d
 
             df_1d = pd.DataFrame(
                 ohlcv_1d,
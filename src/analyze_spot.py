@@ -1,16 +1,13 @@
-import pandas as pd
-from tqdm import tqdm
 from typing import List
 from src.utils.db.file_store import FileStore
-from src.utils.helpers import filter_by_market_cap_rank
+from src.utils.helpers import filter_by_market_cap_rank, ohlcv_to_dataframe
 from src.utils.clients.binance_client import BinanceClient, Timeframe as BinanceTimeframe
-from src.services.analyze_market import SpotAnalyzerV1, AnalysisResult, Timeframe as AnalyzeTimeframe
+from src.services.analyze_market import AnalysisResult, Timeframe as AnalyzeTimeframe, analyze_symbols
 
 class AnalyzeSpot:
     def __init__(self):
         self.file_store = FileStore()
         self.binance_client = BinanceClient()
-        self.spot_analyzer = SpotAnalyzerV1()
 
     def analyze_spot(self) -> List[AnalysisResult]:
         """分析現貨市場並返回前 10 個最有信心的交易機會"""
@@ -21,48 +18,27 @@ class AnalyzeSpot:
         # 根據市值排名過濾市場
         filtered_markets = filter_by_market_cap_rank(markets, market_caps, max_rank=50)
         
-        # 分析每個市場
-        results = []
-        for market in tqdm(
-            filtered_markets,
-            desc="Analyzing Markets",
-            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}]",
-            colour="green",
-        ):
+        # 每個時間框架一次並行獲取所有市場的 OHLCV 數據
+        symbols = [market.symbol for market in filtered_markets]
+        ohlcv_6h_by_symbol = self.binance_client.fetch_ohlcv_batch(symbols, BinanceTimeframe.HOUR_6, limit=100)
+        ohlcv_1d_by_symbol = self.binance_client.fetch_ohlcv_batch(symbols, BinanceTimeframe.DAY_1, limit=100)
+        
+        # 檢查每個市場的數據
+        payloads = []
+        for market in filtered_markets:
             try:
-                # 獲取 OHLCV 數據
-                ohlcv_6h = self.binance_client.fetch_ohlcv(
-                    market.symbol,
-                    BinanceTimeframe.HOUR_6,
-                    limit=100,
-                )
-                ohlcv_1d = self.binance_client.fetch_ohlcv(
-                    market.symbol,
-                    BinanceTimeframe.DAY_1,
-                    limit=100,
-                )
+                ohlcv_6h = ohlcv_6h_by_symbol[market.symbol]
+                ohlcv_1d = ohlcv_1d_by_symbol[market.symbol]
+                # 獲取失敗的市場對應的是例外
+                for ohlcv in [ohlcv_6h, ohlcv_1d]:
+                    if isinstance(ohlcv, Exception):
+                        raise ohlcv
                 
-                # 轉換為 DataFrame 並正確處理時間戳記
-                df_6h = pd.DataFrame(
-                    ohlcv_6h,
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                )
-                df_1d = pd.DataFrame(
-                    ohlcv_1d,
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                )
+                # 轉換為以時間戳記為索引、已排序的 float DataFrame
+                df_6h = ohlcv_to_dataframe(ohlcv_6h)
+                df_1d = ohlcv_to_dataframe(ohlcv_1d)
                 
-                # 確保數據類型正確
                 for df in [df_6h, df_1d]:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                    df.set_index('timestamp', inplace=True)
-                    # 確保所有價格和交易量列是 float 類型
-                    for col in ['open', 'high', 'low', 'close', 'volume']:
-                        df[col] = df[col].astype(float)
-                    
-                    # 確保數據按時間排序
-                    df.sort_index(inplace=True)
-                    
                     # 確保沒有缺失值
                     if df.isnull().values.any():
                         raise ValueError(f"數據中存在缺失值")
@@ -73,15 +49,11 @@ class AnalyzeSpot:
             except Exception as e:
                 continue
 
-            # 如果通過所有檢查，才進行分析
-            try:
-                # 分析市場
-                result = self.spot_analyzer.analyze(market.symbol, df_6h, df_1d)
-                results.append(result)
-                
-            except Exception as e:
-                print(f"分析 {market.symbol} 時發生錯誤: {str(e)}")
-                continue
+            # 如果通過所有檢查，才加入分析
+            payloads.append((market.symbol, df_6h, df_1d))
+        
+        # 以多進程分析所有市場
+        results = analyze_symbols('spot_v1', payloads)
         
         # 根據信心度排序並返回前 10 個結果
         sorted_results = sorted(
@@ -1,11 +1,10 @@
 import pandas as pd
-from tqdm import tqdm
 from typing import List
 from datetime import datetime
 from src.utils.db.file_store import FileStore
-from src.utils.helpers import filter_by_market_cap_rank
+from src.utils.helpers import filter_by_market_cap_rank, ohlcv_to_dataframe
 from src.utils.clients.binance_client import BinanceClient, Timeframe as BinanceTimeframe
-from src.services.swap_analyzer_v2 import SwapAnalyzerV2
+from src.services.swap_analyzer_v2 import analyze_symbols
 
 def analyze_swap() -> List:
     """分析合約市場並返回前 10 個最有信心的交易機會"""
@@ -13,7 +12,6 @@ def analyze_swap() -> List:
     # 1. 初始化所需的服務
     file_store = FileStore()
     binance_client = BinanceClient()
-    swap_analyzer = SwapAnalyzerV2()
     
     # 2. 獲取市場數據
     markets = file_store.find_all_swap()
@@ -22,48 +20,27 @@ def analyze_swap() -> List:
     # 3. 根據市值排名過濾市場
     filtered_markets = filter_by_market_cap_rank(markets, market_caps, max_rank=500)
     
-    # 4. 分析每個市場
-    results = []
-    for market in tqdm(
-        filtered_markets,
-        desc="Analyzing Futures Markets",
-        bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}]",
-        colour="blue",
-    ):
+    # 4. 每個時間框架一次並行獲取所有市場的 OHLCV 數據，增加獲取的數據點以確保有足夠的數據計算指標
+    symbols = [market.symbol for market in filtered_markets]
+    ohlcv_6h_by_symbol = binance_client.fetch_ohlcv_batch(symbols, BinanceTimeframe.HOUR_6, limit=300)
+    ohlcv_1d_by_symbol = binance_client.fetch_ohlcv_batch(symbols, BinanceTimeframe.DAY_1, limit=300)
+    
+    # 檢查每個市場的數據
+    payloads = []
+    for market in filtered_markets:
         try:
-            # 獲取 OHLCV 數據，增加獲取的數據點以確保有足夠的數據計算指標
-            ohlcv_6h = binance_client.fetch_ohlcv(
-                market.symbol,
-                BinanceTimeframe.HOUR_6,
-                limit=300,  # 增加數據點以確保有足夠的歷史數據
-            )
-            ohlcv_1d = binance_client.fetch_ohlcv(
-                market.symbol,
-                BinanceTimeframe.DAY_1,
-                limit=300,  # 增加數據點以確保有足夠的歷史數據
-            )
+            ohlcv_6h = ohlcv_6h_by_symbol[market.symbol]
+            ohlcv_1d = ohlcv_1d_by_symbol[market.symbol]
+            # 獲取失敗的市場對應的是例外
+            for ohlcv in [ohlcv_6h, ohlcv_1d]:
+                if isinstance(ohlcv, Exception):
+                    raise ohlcv
             
-            # 轉換為 DataFrame 並正確處理時間戳記
-            df_6h = pd.DataFrame(
-                ohlcv_6h,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df_1d = pd.DataFrame(
-                ohlcv_1d,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
+            # 轉換為以時間戳記為索引、已排序的 float DataFrame
+            df_6h = ohlcv_to_dataframe(ohlcv_6h)
+            df_1d = ohlcv_to_dataframe(ohlcv_1d)
             
-            # 確保數據類型正確
             for df in [df_6h, df_1d]:
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                # 確保所有價格和交易量列是 float 類型
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    df[col] = df[col].astype(float)
-                
-                # 確保數據按時間排序
-                df.sort_index(inplace=True)
-                
                 # 檢查是否有零交易量的情況
                 if (df['volume'] == 0).any():
                     raise ValueError("數據中存在零交易量")
@@ -76,20 +53,15 @@ def analyze_swap() -> List:
             print(f"分析 {market.symbol} 時發生錯誤: {str(e)}")
             continue
             
-        # 如果通過所有檢查，才進行分析
-        try:
-            # 分析前 200 個數據點，但使用額外的數據點來避免 NA 值的影響
-            result_6h = swap_analyzer.analyze_signals(swap_analyzer.calculate(df_6h))
-            result_1d = swap_analyzer.analyze_signals(swap_analyzer.calculate(df_1d))
-            
-            results.append({
-                'symbol': market.symbol,
-                'result': result_6h.iloc[-1],
-            })
-            
-        except Exception as e:
-            print(f"分析 {market.symbol} 時發生錯誤: {str(e)}")
-            continue
+        # 如果通過所有檢查，才加入分析
+        # 目前只使用 6h 的結果，1d 數據僅用於上面的數據品質檢查
+        payloads.append((market.symbol, df_6h))
+    
+    # 以多進程分析所有市場
+    results = [
+        {'symbol': symbol, 'result': result}
+        for symbol, result in analyze_symbols(payloads, desc="Analyzing Futures Markets")
+    ]
     
     # 5. 根據信心度排序並返回前 10 個結果
     sorted_results = sorted(
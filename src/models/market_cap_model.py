@@ -41,11 +41,20 @@ class MarketCapModel(BaseModel):
         class Config:
             frozen = True
 
+    class Listings(BaseModel):
+        """列表 API 響應，只解析 data 欄位"""
+        data: List['MarketCapModel.Crypto'] = Field(description="加密貨幣列表")
+
     @classmethod
     def from_api_response(cls, response: List[Dict]) -> List['MarketCapModel.Crypto']:
         """從 API 響應創建模型實例"""
         return [cls.Crypto.model_validate(item) for item in response]
     
+    @classmethod
+    def from_api_json(cls, content: bytes) -> List['MarketCapModel.Crypto']:
+        """直接從 API 響應的原始 JSON 創建模型實例，不必先建立完整的 dict 樹"""
+        return cls.Listings.model_validate_json(content).data
+    
     @staticmethod
     def to_dataframe(cryptos: List['MarketCapModel.Crypto']) -> pd.DataFrame:
         """Convert list of Crypto models to DataFrame
@@ -1,9 +1,15 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Protocol
+from collections import namedtuple
+from typing import List, Dict, Optional, Protocol, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from abc import ABC, abstractmethod
 import pandas as pd
+from tqdm import tqdm
 from enum import Enum
 import numpy as np
+import os
+from math import isfinite
 
 from src.services.indicators.indicator import Indicator
 from src.services.indicators.rsi import RSI
@@ -12,13 +18,24 @@ from src.services.indicators.volume_profile import VolumeProfile
 from src.services.indicators.macd import MACD
 from src.services.indicators.bollinger_bands import BollingerBands
 from src.services.leverage_calculator import LeverageCalculator
+from src.utils.logging import setup_logging
+
+# RSI 分數查表：以 |rsi - 50| 的距離分段，區間為 (..., 10], (10, 20], (20, 30], (30, ...)
+# 對應原本 40-60 / 30-70 / 20-80 的階梯判斷，邊界行為一致
+RSI_DISTANCE_BINS = np.array([10.0, 20.0, 30.0])
+SPOT_RSI_SCORES = np.array([0.3, 0.15, 0.0, 0.0])
+SWAP_RSI_SCORES = np.array([0.2, 0.1, 0.05, 0.0])
+
+def rsi_score(rsi, scores: np.ndarray):
+    """Branchless RSI score lookup, works for both scalar and ndarray ``rsi``"""
+    return scores[np.searchsorted(RSI_DISTANCE_BINS, np.abs(rsi - 50.0), side='left')]
 
 class Timeframe(str, Enum):
     """Trading timeframe"""
     HOUR_6 = '6h'
     DAY_1 = '1d'
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     """Analysis result for both spot and swap"""
     symbol: str
@@ -31,47 +48,77 @@ class AnalysisResult:
     leverage: Optional[float] = None  # Only for swap
     description: Optional[str] = None
 
+EntryPoints = namedtuple('EntryPoints', 'entry stop_loss take_profit')
+
 class MarketAnalyzer(ABC):
     """Base class for market analyzers"""
     
+    # 分析時需要用到的最新指標值
+    required_columns: List[str] = []
+    
     def __init__(self, indicators: List[Indicator]):
         self.indicators = indicators
         self.timeframe_weights = {
             Timeframe.HOUR_6: 0.4,
             Timeframe.DAY_1: 0.6
         }
+        # 權重固定，預先取出避免每次計算時的 enum 查表
+        self._w6 = self.timeframe_weights[Timeframe.HOUR_6]
+        self._w1d = self.timeframe_weights[Timeframe.DAY_1]
     
     def _calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all indicators"""
-        # 計算所有指標
+        # 計算所有指標，並一次性合併到 DataFrame
+        columns = {}
         for indicator in self.indicators:
-            df = indicator.calculate(df)
-            
+            columns.update(indicator.compute(df))
+        df = df.assign(**columns)
+
         # 移除初始化期間的數據點（前 30 個），這些數據點可能包含 NA 值
         df = df.iloc[60:]
         
         # 確保沒有 NA 值
-        if df.isnull().values.any():
-            missing_columns = df.columns[df.isnull().any()].tolist()
+        # 單次掃描同時取得是否有 NA 以及受影響的列
+        null_columns = df.isna().to_numpy().any(axis=0)
+        if null_columns.any():
+            missing_columns = df.columns[null_columns].tolist()
             raise ValueError(f"數據中存在 NA 值，影響的列：{missing_columns}")
             
         return df
     
-    def _calculate_confidence(self, df_6h: pd.DataFrame, df_1d: pd.DataFrame) -> float:
+    def _validate_latest(self, df: pd.DataFrame) -> Dict[str, float]:
+        """Validate the latest indicator values once and return them as floats"""
+        if len(df) == 0:
+            raise ValueError("數據框為空")
+            
+        # OHLCV 通常已按時間排序，只有在必要時才重新排序
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        # 逐欄以位置取值，不必先建立整列的 Series
+        values = {}
+        for column in self.required_columns:
+            if column not in df.columns:
+                raise ValueError(f"缺少必要的指標: {column}")
+            value = float(df[column].iat[-1])
+            if not isfinite(value):
+                raise ValueError(f"指標 {column} 的值無效: {value}")
+            values[column] = value
+        return values
+    
+    def _calculate_confidence(self, latest_6h: Dict[str, float], latest_1d: Dict[str, float]) -> float:
         """Calculate overall confidence score"""
-        confidence_6h = self._calculate_timeframe_confidence(df_6h)
-        confidence_1d = self._calculate_timeframe_confidence(df_1d)
+        confidence_6h = self._calculate_timeframe_confidence(latest_6h)
+        confidence_1d = self._calculate_timeframe_confidence(latest_1d)
         
-        return (confidence_6h * self.timeframe_weights[Timeframe.HOUR_6] +
-                confidence_1d * self.timeframe_weights[Timeframe.DAY_1])
+        return confidence_6h * self._w6 + confidence_1d * self._w1d
     
     @abstractmethod
-    def _calculate_timeframe_confidence(self, df: pd.DataFrame) -> float:
+    def _calculate_timeframe_confidence(self, latest: Dict[str, float]) -> float:
         """Calculate confidence score for a single timeframe"""
         pass
     
     @abstractmethod
-    def _calculate_entry_points(self, df_6h: pd.DataFrame, df_1d: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_entry_points(self, latest_6h: Dict[str, float], latest_1d: Dict[str, float]) -> EntryPoints:
         """Calculate entry, stop loss and take profit prices"""
         pass
     
@@ -83,6 +130,8 @@ class MarketAnalyzer(ABC):
 class SpotAnalyzerV1(MarketAnalyzer):
     """Spot market analyzer version 1"""
     
+    required_columns = ['close', 'atr', 'rsi', 'macd', 'macd_signal', 'poc_price']
+    
     def __init__(self):
         indicators = [
             RSI(14),
@@ -92,67 +141,23 @@ class SpotAnalyzerV1(MarketAnalyzer):
         ]
         super().__init__(indicators)
     
-    def _calculate_timeframe_confidence(self, df: pd.DataFrame) -> float:
-        # 確保使用最新的數據
-        if not isinstance(df.index, pd.DatetimeIndex):
-            raise ValueError("DataFrame 必須使用時間戳記作為索引")
-            
-        latest = df.sort_index().iloc[-1]
-        
-        # 檢查必要的指標是否存在
-        required_indicators = ['rsi', 'macd', 'macd_signal', 'poc_price']
-        for indicator in required_indicators:
-            if indicator not in latest.index:
-                raise ValueError(f"缺少必要的指標: {indicator}")
-            if pd.isna(latest[indicator]):
-                raise ValueError(f"指標 {indicator} 的值為 NA")
-        
+    def _calculate_timeframe_confidence(self, latest: Dict[str, float]) -> float:
         confidence = 0.0
         
         # RSI contribution (30%)
-        rsi = latest['rsi']
-        if pd.isna(rsi):
-            raise ValueError("RSI 值為空")
-            
-        if 40 <= rsi <= 60:
-            confidence += 0.3
-        elif (30 <= rsi < 40) or (60 < rsi <= 70):
-            confidence += 0.15
+        confidence += float(rsi_score(latest['rsi'], SPOT_RSI_SCORES))
         
         # MACD contribution (30%)
-        if pd.isna(latest['macd']) or pd.isna(latest['macd_signal']):
-            raise ValueError("MACD 或 MACD Signal 值為空")
-            
         if latest['macd'] > latest['macd_signal']:
             confidence += 0.3
         
         # Volume Profile contribution (40%)
-        if pd.isna(latest['poc_price']):
-            raise ValueError("POC 價格值為空")
-            
         if latest['close'] > latest['poc_price']:
             confidence += 0.4
         
         return confidence
     
-    def _calculate_entry_points(self, df_6h: pd.DataFrame, df_1d: pd.DataFrame) -> Dict[str, float]:
-        # 確保使用時間戳記索引
-        if not isinstance(df_6h.index, pd.DatetimeIndex):
-            raise ValueError("DataFrame 必須使用時間戳記作為索引")
-            
-        if len(df_6h) == 0:
-            raise ValueError("6小時數據為空")
-            
-        latest_6h = df_6h.sort_index().iloc[-1]
-        
-        # 檢查 ATR 是否存在且有效
-        if 'atr' not in latest_6h.index or pd.isna(latest_6h['atr']):
-            raise ValueError("ATR 值無效或不存在")
-        
-        # 檢查收盤價是否有效
-        if pd.isna(latest_6h['close']):
-            raise ValueError("收盤價無效")
-            
+    def _calculate_entry_points(self, latest_6h: Dict[str, float], latest_1d: Dict[str, float]) -> EntryPoints:
         atr = latest_6h['atr']
         entry = latest_6h['close']
         
@@ -167,11 +172,7 @@ class SpotAnalyzerV1(MarketAnalyzer):
         if any(price <= 0 for price in [entry, stop_loss, take_profit]):
             raise ValueError("計算出的價格包含非正數")
             
-        return {
-            'entry': entry,
-            'stop_loss': stop_loss,
-            'take_profit': take_profit
-        }
+        return EntryPoints(entry, stop_loss, take_profit)
     
     def analyze(self, symbol: str, df_6h: pd.DataFrame, df_1d: pd.DataFrame) -> AnalysisResult:
         # 檢查數據框是否為空
@@ -190,23 +191,28 @@ class SpotAnalyzerV1(MarketAnalyzer):
         except Exception as e:
             raise ValueError(f"計算指標時出錯: {str(e)}")
         
+        # 一次性驗證並取出最新的指標值
+        latest_6h = self._validate_latest(df_6h)
+        latest_1d = self._validate_latest(df_1d)
+        
         # Calculate confidence
-        confidence = self._calculate_confidence(df_6h, df_1d)
+        confidence = self._calculate_confidence(latest_6h, latest_1d)
+        
+        # 信心度超出範圍時直接返回錯誤，不必再計算進場點
+        if not (0 <= confidence <= 1):
+            raise ValueError(f"信心度超出範圍: {confidence}")
         
         # Calculate entry points
-        points = self._calculate_entry_points(df_6h, df_1d)
+        entry, stop_loss, take_profit = self._calculate_entry_points(latest_6h, latest_1d)
         
         # 計算預期報酬時檢查除數不為零
-        denominator = points['entry'] - points['stop_loss']
+        denominator = entry - stop_loss
         if abs(denominator) < 0.00001:
             raise ValueError("無法計算預期報酬：入場價與止損價過於接近")
             
-        expected_return = (points['take_profit'] - points['entry']) / denominator
+        expected_return = (take_profit - entry) / denominator
         
-        # 確保所有計算結果都在合理範圍內
-        if not (0 <= confidence <= 1):
-            raise ValueError(f"信心度超出範圍: {confidence}")
-            
+        # 確保預期報酬在合理範圍內
         if expected_return <= 0:
             raise ValueError(f"預期報酬為負值: {expected_return}")
         
@@ -214,15 +220,20 @@ class SpotAnalyzerV1(MarketAnalyzer):
             symbol=symbol,
             signal_type=confidence,
             confidence=confidence,
-            entry_price=points['entry'],
-            stop_loss=points['stop_loss'],
-            take_profit=points['take_profit'],
+            entry_price=entry,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
             expected_return=expected_return
         )
 
 class SwapAnalyzerV1(MarketAnalyzer):
     """Swap market analyzer version 1"""
     
+    required_columns = [
+        'close', 'volume', 'atr', 'rsi', 'macd', 'macd_signal', 'poc_price',
+        'bb_upper', 'bb_middle', 'bb_lower'
+    ]
+    
     def __init__(self):
         indicators = [
             RSI(14),
@@ -234,8 +245,7 @@ class SwapAnalyzerV1(MarketAnalyzer):
         super().__init__(indicators)
         self.leverage_calculator = LeverageCalculator()
     
-    def _calculate_timeframe_confidence(self, df: pd.DataFrame) -> float:
-        latest = df.iloc[-1]
+    def _calculate_timeframe_confidence(self, latest: Dict[str, float]) -> float:
         confidence = 0.0
         
         # Initialize confidence components
@@ -245,47 +255,32 @@ class SwapAnalyzerV1(MarketAnalyzer):
         bb_confidence = 0.0
         
         # RSI contribution (20%)
-        if not (pd.isna(latest['rsi']) or np.isinf(latest['rsi'])):
-            rsi = latest['rsi']
-            if 40 <= rsi <= 60:
-                rsi_confidence = 0.2
-            elif (30 <= rsi < 40) or (60 < rsi <= 70):
-                rsi_confidence = 0.1
-            elif (20 <= rsi < 30) or (70 < rsi <= 80):
-                rsi_confidence = 0.05
+        rsi_confidence = float(rsi_score(latest['rsi'], SWAP_RSI_SCORES))
         
         # MACD contribution (20%)
-        if not (pd.isna(latest['macd']) or pd.isna(latest['macd_signal']) or 
-               np.isinf(latest['macd']) or np.isinf(latest['macd_signal'])):
-            macd_diff = latest['macd'] - latest['macd_signal']
-            if abs(macd_diff) > 0:  # If there's any difference
-                macd_confidence = 0.2 if latest['macd'] > latest['macd_signal'] else 0.1
+        macd_diff = latest['macd'] - latest['macd_signal']
+        if abs(macd_diff) > 0:  # If there's any difference
+            macd_confidence = 0.2 if latest['macd'] > latest['macd_signal'] else 0.1
         
         # Volume Profile contribution (30%)
-        if not (pd.isna(latest['poc_price']) or np.isinf(latest['poc_price']) or 
-               pd.isna(latest['close']) or np.isinf(latest['close'])):
-            price_diff = abs(latest['close'] - latest['poc_price'])
-            if price_diff > 0:
-                if latest['close'] > latest['poc_price']:
-                    volume_confidence = 0.3
-                else:
-                    volume_confidence = 0.15
+        price_diff = abs(latest['close'] - latest['poc_price'])
+        if price_diff > 0:
+            if latest['close'] > latest['poc_price']:
+                volume_confidence = 0.3
+            else:
+                volume_confidence = 0.15
         
         # Bollinger Bands contribution (30%)
-        if not (pd.isna(latest['bb_middle']) or np.isinf(latest['bb_middle']) or
-               pd.isna(latest['bb_upper']) or np.isinf(latest['bb_upper']) or
-               pd.isna(latest['bb_lower']) or np.isinf(latest['bb_lower'])):
-            
-            bb_range = latest['bb_upper'] - latest['bb_lower']
-            if bb_range > 0:  # Ensure bands aren't collapsed
-                if latest['close'] > latest['bb_middle']:
-                    if latest['close'] < latest['bb_upper']:
-                        bb_confidence = 0.3
-                    else:
-                        bb_confidence = 0.15
+        bb_range = latest['bb_upper'] - latest['bb_lower']
+        if bb_range > 0:  # Ensure bands aren't collapsed
+            if latest['close'] > latest['bb_middle']:
+                if latest['close'] < latest['bb_upper']:
+                    bb_confidence = 0.3
                 else:
-                    if latest['close'] > latest['bb_lower']:
-                        bb_confidence = 0.15
+                    bb_confidence = 0.15
+            else:
+                if latest['close'] > latest['bb_lower']:
+                    bb_confidence = 0.15
         
         # Calculate total confidence
         confidence = rsi_confidence + macd_confidence + volume_confidence + bb_confidence
@@ -296,19 +291,12 @@ class SwapAnalyzerV1(MarketAnalyzer):
             
         return confidence
     
-    def _calculate_entry_points(self, df_6h: pd.DataFrame, df_1d: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_entry_points(self, latest_6h: Dict[str, float], latest_1d: Dict[str, float]) -> EntryPoints:
         """
         Dynamic entry point calculation for crypto markets
         Considers multiple indicators and market dynamics
         """
-        latest_6h = df_6h.iloc[-1]
-        latest_1d = df_1d.iloc[-1]
-        
         # 1. 波動性分析 (使用 ATR)
-        if (pd.isna(latest_6h['atr']) or np.isinf(latest_6h['atr']) or 
-            pd.isna(latest_1d['atr']) or np.isinf(latest_1d['atr'])):
-            raise ValueError("Invalid ATR values")
-        
         # 結合 6h 和 1d 的 ATR，但加入更複雜的權重計算
         volatility_factor = (
             latest_6h['atr'] * 0.4 + 
@@ -316,10 +304,6 @@ class SwapAnalyzerV1(MarketAnalyzer):
         )
         
         # 2. 趨勢強度分析 (結合 MACD 和 RSI)
-        if (pd.isna(latest_6h['macd']) or pd.isna(latest_6h['macd_signal']) or 
-            pd.isna(latest_6h['rsi'])):
-            raise ValueError("Missing MACD or RSI indicators")
-        
         # MACD 趨勢強度
         macd_trend_strength = (
             1 if latest_6h['macd'] > latest_6h['macd_signal'] else -1
@@ -331,19 +315,12 @@ class SwapAnalyzerV1(MarketAnalyzer):
         )
         
         # 3. 成交量分析 (使用成交量分佈指標)
-        if pd.isna(latest_6h['poc_price']):
-            raise ValueError("Missing Volume Profile indicator")
-        
         # 計算與成交量集中點的關係
         volume_alignment = (
             1 if latest_6h['close'] > latest_6h['poc_price'] else -1
         )
         
         # 4. 布林帶分析
-        if (pd.isna(latest_6h['bb_middle']) or pd.isna(latest_6h['bb_upper']) or 
-            pd.isna(latest_6h['bb_lower'])):
-            raise ValueError("Missing Bollinger Bands indicators")
-        
         # 布林帶位置
         bb_band_width = latest_6h['bb_upper'] - latest_6h['bb_lower']
         if abs(bb_band_width) < 1e-8:  # 防止除零
@@ -380,51 +357,43 @@ class SwapAnalyzerV1(MarketAnalyzer):
         if stop_loss <= 0 or take_profit <= 0:
             raise ValueError("Invalid stop loss or take profit values")
         
-        return {
-            'entry': entry,
-            'stop_loss': stop_loss,
-            'take_profit': take_profit,
-        }
+        return EntryPoints(entry, stop_loss, take_profit)
     
-    def _calculate_leverage(self, df_6h: pd.DataFrame) -> float:
+    def _calculate_leverage(self, latest: Dict[str, float]) -> float:
         """Calculate suggested leverage based on volatility and trend strength"""
-        latest = df_6h.iloc[-1]
-        
-        # Validate values
-        if (pd.isna(latest['atr']) or np.isinf(latest['atr']) or
-            pd.isna(latest['close']) or np.isinf(latest['close']) or
-            latest['close'] <= 0):
+        if latest['close'] <= 0:
             return 2.0  # Return conservative leverage if values are invalid
             
         # Calculate volatility
         volatility = latest['atr'] / latest['close']
         
         # Calculate trend strength based on MACD and RSI
-        trend_strength = 0.5  # Default value
-        if not (pd.isna(latest['macd']) or pd.isna(latest['macd_signal']) or 
-               pd.isna(latest['rsi'])):
-            # MACD trend component (0-0.5)
-            macd_strength = 0.5 if latest['macd'] > latest['macd_signal'] else 0.0
+        # MACD trend component (0-0.5)
+        macd_strength = 0.5 if latest['macd'] > latest['macd_signal'] else 0.0
+        
+        # RSI trend component (0-0.5)
+        rsi = latest['rsi']
+        if rsi > 60:
+            rsi_strength = 0.5
+        elif rsi > 50:
+            rsi_strength = 0.25
+        else:
+            rsi_strength = 0.0
             
-            # RSI trend component (0-0.5)
-            rsi = latest['rsi']
-            if rsi > 60:
-                rsi_strength = 0.5
-            elif rsi > 50:
-                rsi_strength = 0.25
-            else:
-                rsi_strength = 0.0
-                
-            trend_strength = macd_strength + rsi_strength
+        trend_strength = macd_strength + rsi_strength
         
         # Use LeverageCalculator to get suggested leverage
         leverage_info = self.leverage_calculator.calculate(volatility, trend_strength)
         return float(leverage_info.suggested_leverage)
     
-    def _calculate_signal_type(self, df_6h: pd.DataFrame, df_1d: pd.DataFrame) -> float:
-        latest_6h = df_6h.iloc[-1]
-        latest_1d = df_1d.iloc[-1]
-
+    def _calculate_signal_type(
+        self,
+        latest_6h: Dict[str, float],
+        latest_1d: Dict[str, float],
+        df_6h: pd.DataFrame,
+        df_1d: pd.DataFrame
+    ) -> float:
+        """Calculate continuous signal strength (-1 to 1); DataFrames are only used for rolling windows"""
         # 改用連續數值計算
         signal_score = 0.0
         
@@ -435,20 +404,20 @@ class SwapAnalyzerV1(MarketAnalyzer):
 
         # 2. 波動率過濾 (權重 20%)
         bb_band_width = latest_6h['bb_upper'] - latest_6h['bb_lower']
-        avg_band_width = df_6h['bb_upper'].iloc[-20:].mean() - df_6h['bb_lower'].iloc[-20:].mean()
+        avg_band_width = df_6h['bb_upper'].to_numpy()[-20:].mean() - df_6h['bb_lower'].to_numpy()[-20:].mean()
         volatility_ratio = bb_band_width / (avg_band_width + 1e-8)  # 防止除零
         signal_score += np.clip(volatility_ratio - 0.5, -0.2, 0.2)  # 波動率貢獻在 ±0.2 之間
 
         # 3. 成交量驗證 (權重 15%)
-        volume_ratio = latest_1d['volume'] / (df_1d['volume'].rolling(14).mean().iloc[-1] + 1e-8)
+        # 只需要最後一個 14 期均量，不必計算整條滾動序列
+        volume_ratio = latest_1d['volume'] / (df_1d['volume'].to_numpy()[-14:].mean() + 1e-8)
         volume_factor = np.clip((volume_ratio - 1) * 0.15, -0.15, 0.15)  # 成交量貢獻在 ±0.15 之間
         signal_score += volume_factor
 
         # 4. 市場結構分析 (權重 25%)
-        swing_highs = df_6h['high'].rolling(5, center=True).max().dropna()
-        swing_lows = df_6h['low'].rolling(5, center=True).min().dropna()
-        recent_high = swing_highs.iloc[-3:].max()
-        recent_low = swing_lows.iloc[-3:].min()
+        # 最後 3 個完整的 5 根置中窗口合起來正好覆蓋最後 7 根 K 線
+        recent_high = df_6h['high'].to_numpy()[-7:].max()
+        recent_low = df_6h['low'].to_numpy()[-7:].min()
         
         bullish_break = (latest_6h['close'] - recent_high) / recent_high  # 突破幅度
         bearish_break = (recent_low - latest_6h['close']) / recent_low
@@ -465,10 +434,6 @@ class SwapAnalyzerV1(MarketAnalyzer):
         final_score = np.tanh(signal_score * 2)  # 用 tanh 壓縮到 -1~1 範圍
         final_score = np.clip(final_score, -1.0, 1.0)
 
-        # 新增異常值檢查
-        if pd.isnull([latest_6h['bb_middle'], latest_1d['bb_middle']]).any():
-            raise ValueError("Bollinger Bands values contain NA")
-
         return final_score
     
     def analyze(self, symbol: str, df_6h: pd.DataFrame, df_1d: pd.DataFrame) -> AnalysisResult:
@@ -477,75 +442,116 @@ class SwapAnalyzerV1(MarketAnalyzer):
             df_6h = self._calculate_indicators(df_6h)
             df_1d = self._calculate_indicators(df_1d)
             
-            # Validate dataframes
-            if df_6h.isnull().values.any() or df_1d.isnull().values.any():
-                raise ValueError("Data contains NA values")
+            # 一次性驗證並取出最新的指標值（NA 已在 _calculate_indicators 中檢查）
+            latest_6h = self._validate_latest(df_6h)
+            latest_1d = self._validate_latest(df_1d)
                 
             # Calculate confidence
-            confidence = self._calculate_confidence(df_6h, df_1d)
+            confidence = self._calculate_confidence(latest_6h, latest_1d)
             
             # If confidence is 0, skip further calculations
             if confidence == 0:
                 raise ValueError("Insufficient confidence due to invalid data")
                 
             # Calculate entry points
-            points = self._calculate_entry_points(df_6h, df_1d)
+            entry, stop_loss, take_profit = self._calculate_entry_points(latest_6h, latest_1d)
             
             # Calculate leverage
-            leverage = self._calculate_leverage(df_6h)
+            leverage = self._calculate_leverage(latest_6h)
             
             # Calculate expected return (adjusted for leverage)
-            denominator = points['entry'] - points['stop_loss']
+            denominator = entry - stop_loss
             if abs(denominator) < 0.00001:
                 raise ValueError("Entry and stop loss prices are too close")
                 
-            expected_return = ((points['take_profit'] - points['entry']) / points['entry']) * leverage
+            expected_return = ((take_profit - entry) / entry) * leverage
             
             # Validate expected return
-            if pd.isna(expected_return) or np.isinf(expected_return):
+            if not isfinite(expected_return):
                 raise ValueError("Invalid expected return value")
                 
             # Determine signal type based on position
-            signal_type = self._calculate_signal_type(df_6h, df_1d)
+            signal_type = self._calculate_signal_type(latest_6h, latest_1d, df_6h, df_1d)
             
             return AnalysisResult(
                 symbol=symbol,
                 signal_type=signal_type,
                 confidence=confidence,
-                entry_price=points['entry'],
-                stop_loss=points['stop_loss'],
-                take_profit=points['take_profit'],
+                entry_price=entry,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
                 expected_return=expected_return,
                 leverage=leverage
             )
         except Exception as e:
             raise ValueError(f"分析失敗: {str(e)}")
 
-# class AnalyzerFactory:
-#     """Factory for creating market analyzers"""
+ANALYZER_TYPES = {
+    'spot_v1': SpotAnalyzerV1,
+    'swap_v1': SwapAnalyzerV1,
+}
+
+@lru_cache(maxsize=None)
+def get_analyzer(analyzer_type: str) -> MarketAnalyzer:
+    """Return the shared analyzer instance for ``analyzer_type``, built on first use"""
+    if analyzer_type not in ANALYZER_TYPES:
+        raise ValueError(f"Unknown analyzer type: {analyzer_type}")
+    return ANALYZER_TYPES[analyzer_type]()
+
+# 每個工作進程只建立一次分析器
+_worker_analyzer: Optional[MarketAnalyzer] = None
+
+def _init_worker(analyzer_type: str):
+    global _worker_analyzer
+    _worker_analyzer = get_analyzer(analyzer_type)
+
+def _worker(item: Tuple[str, pd.DataFrame, pd.DataFrame]):
+    symbol, df_6h, df_1d = item
+    try:
+        return _worker_analyzer.analyze(symbol, df_6h, df_1d)
+    except Exception as e:
+        return e
+
+def analyze_symbols(
+    analyzer_type: str,
+    payloads: List[Tuple[str, pd.DataFrame, pd.DataFrame]],
+    max_workers: Optional[int] = None,
+    desc: str = "Analyzing Markets"
+) -> List[AnalysisResult]:
+    """Analyze (symbol, df_6h, df_1d) payloads in parallel, skipping symbols that fail"""
+    if analyzer_type not in ANALYZER_TYPES:
+        raise ValueError(f"Unknown analyzer type: {analyzer_type}")
+    if not payloads:
+        return []
+        
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(payloads) // (4 * workers))
     
-#     @staticmethod
-#     def create_analyzer(analyzer_type: str) -> MarketAnalyzer:
-#         if analyzer_type == 'spot_v1':
-#             return SpotAnalyzerV1()
-#         elif analyzer_type == 'swap_v1':
-#             return SwapAnalyzerV1()
-#         else:
-#             raise ValueError(f"Unknown analyzer type: {analyzer_type}")
+    logger = setup_logging(__name__)
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(analyzer_type,)
+    ) as executor:
+        progress = tqdm(
+            zip(payloads, executor.map(_worker, payloads, chunksize=chunksize)),
+            total=len(payloads),
+            desc=desc,
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}]",
+        )
+        for (symbol, _, _), result in progress:
+            if isinstance(result, Exception):
+                logger.warning(f"分析 {symbol} 時發生錯誤: {str(result)}")
+                continue
+            results.append(result)
+            
+    return results
 
-# # Usage example
+# # Usage example（需要提供實際的 OHLCV DataFrame，空的 DataFrame 會在分析時拋出錯誤）
 # if __name__ == "__main__":
-#     # Create analyzers
-#     spot_analyzer = AnalyzerFactory.create_analyzer('spot_v1')
-#     swap_analyzer = AnalyzerFactory.create_analyzer('swap_v1')
-    
-#     # Example data (you would need to provide actual DataFrames)
-#     df_6h = pd.DataFrame()
-#     df_1d = pd.DataFrame()
-    
-#     # Analyze
-#     spot_result = spot_analyzer.analyze("BTC/USDT", df_6h, df_1d)
-#     swap_result = swap_analyzer.analyze("BTC/USDT", df_6h, df_1d)
-    
+#     spot_result = get_analyzer('spot_v1').analyze("BTC/USDT", df_6h, df_1d)
+#     swap_result = get_analyzer('swap_v1').analyze("BTC/USDT", df_6h, df_1d)
+#     
 #     print(f"Spot Analysis Result: {spot_result}")
 #     print(f"Swap Analysis Result: {swap_result}")
@@ -34,11 +34,11 @@ class GridAnalyzer:
         pd.DataFrame
             DataFrame containing analysis results with scores for each metric
         """
-        # Calculate all indicators
-        df_1d = self.atr.calculate(df_1d)
-        df_1d = self.rsi.calculate(df_1d)
-        df_1d = self.bb.calculate(df_1d)
-        df_1d = self.obv.calculate(df_1d)
+        # Calculate all indicators and merge them in a single assign
+        columns = {}
+        for indicator in (self.atr, self.rsi, self.bb, self.obv):
+            columns.update(indicator.compute(df_1d))
+        df_1d = df_1d.assign(**columns)
         
         # Calculate scores
         volatility_score = self._calculate_volatility_score(df_1d)
@@ -60,8 +60,9 @@ class GridAnalyzer:
     def _calculate_volatility_score(self, df_1d: pd.DataFrame) -> float:
         """Calculate volatility score based on ATR"""
         # Get the last 30 periods of normalized ATR
-        df_1d.loc[:, 'norm_atr'] = df_1d['atr'] / df_1d['close']
-        recent_norm_atr = df_1d['norm_atr'].tail(30)
+        # 只計算需要的區間，不寫回 DataFrame
+        recent = df_1d.tail(30)
+        recent_norm_atr = recent['atr'] / recent['close']
         
         # Calculate mean and stability of ATR
         mean_norm_atr = recent_norm_atr.mean()
@@ -77,14 +78,14 @@ class GridAnalyzer:
     
     def _calculate_trend_score(self, df_1d: pd.DataFrame) -> float:
         """Calculate trend score based on RSI and Bollinger Bands"""
-        recent_rsi = df_1d['rsi'].tail(30)
+        recent_rsi = df_1d['rsi'].to_numpy()[-30:]
         
         # Check if RSI is between 35-65 most of the time
-        rsi_range_score = len(recent_rsi[(recent_rsi >= 35) & (recent_rsi <= 65)]) / len(recent_rsi)
+        rsi_range_score = float(((recent_rsi >= 35) & (recent_rsi <= 65)).mean())
         
         # Calculate Bollinger Bands width
-        df_1d['bb_width'] = (df_1d['bb_upper'] - df_1d['bb_lower']) / df_1d['bb_middle'].replace(0, float('inf'))
-        recent_bb_width = df_1d['bb_width'].tail(30)
+        recent = df_1d.tail(30)
+        recent_bb_width = (recent['bb_upper'] - recent['bb_lower']) / recent['bb_middle'].replace(0, float('inf'))
         
         # Calculate BB width stability
         bb_width_mean = recent_bb_width.mean()
@@ -101,7 +102,13 @@ class GridAnalyzer:
         recent_obv = df_1d['obv'].tail(30)
         
         # Calculate OBV trend
-        obv_trend = np.corrcoef(recent_obv.index, recent_obv.values, ddof=1)[0, 1]
+        # 與時間位置的 Pearson 相關係數，直接以閉式計算
+        obv_values = recent_obv.to_numpy()
+        x = np.arange(len(obv_values), dtype=np.float64)
+        x -= x.mean()
+        y = obv_values - obv_values.mean()
+        denominator = np.sqrt(np.dot(x, x) * np.dot(y, y))
+        obv_trend = np.dot(x, y) / denominator if denominator > 0 else np.nan
         
         # Calculate OBV stability
         obv_mean = abs(recent_obv.mean())
@@ -130,8 +137,10 @@ class GridAnalyzer:
         current_price = df_1d['close'].iloc[-1]
         
         # Calculate price efficiency ratio
-        price_changes = abs(df_1d['close'].diff(20))
-        price_paths = df_1d['high'].rolling(20).max() - df_1d['low'].rolling(20).min()
+        # 只取最後 20 個值，因此只需要最後 40 根 K 線（20 根加上 20 期回看）
+        recent = df_1d.iloc[-40:]
+        price_changes = abs(recent['close'].diff(20))
+        price_paths = recent['high'].rolling(20).max() - recent['low'].rolling(20).min()
         # Add small epsilon to prevent division by zero
         price_paths = price_paths.replace(0, float('inf'))
         efficiency_ratio = (price_changes / price_paths).fillna(0).tail(20).mean()
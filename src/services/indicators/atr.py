@@ -1,21 +1,23 @@
 import pandas as pd
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class ATR(Indicator):
     def __init__(self, period: int = 14):
         self.period = period
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        df.loc[:, 'atr'] = talib.ATR(
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        atr = talib.ATR(
             df['high'],
             df['low'],
             df['close'],
             timeperiod=self.period
         )
-        df.loc[:, 'atr_pct'] = df['atr'] / df['close'] * 100
-        return df
+        return {
+            'atr': atr,
+            'atr_pct': atr / df['close'] * 100
+        }
     
     def get_name(self) -> str:
-        return f"ATR_{self.period}" 
\ No newline at end of file
+        return f"ATR_{self.period}" 
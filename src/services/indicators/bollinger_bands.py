@@ -1,14 +1,24 @@
 import pandas as pd
 import numpy as np
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class BollingerBands(Indicator):
-    def __init__(self, period: int = 20, num_std: float = 2.0):
+    def __init__(
+        self,
+        period: int = 20,
+        num_std: float = 2.0,
+        with_bandwidth: bool = False,
+        with_percent_b: bool = False
+    ):
         self.period = period
         self.num_std = num_std
+        # 頻寬與 %B 目前沒有分析器使用，只在需要時才計算
+        self.with_bandwidth = with_bandwidth
+        self.with_percent_b = with_percent_b
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         upper, middle, lower = talib.BBANDS(
             df['close'],
             timeperiod=self.period,
@@ -17,26 +27,44 @@ class BollingerBands(Indicator):
             matype=talib.MA_Type.SMA
         )
         
-        df.loc[:, 'bb_upper'] = upper
-        df.loc[:, 'bb_middle'] = middle
-        df.loc[:, 'bb_lower'] = lower
+        columns = {
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower
+        }
+        
+        bb_diff = (upper - lower).to_numpy()
         
         # Calculate bandwidth
-        bb_diff = df['bb_upper'] - df['bb_lower']
-        middle_band = df['bb_middle'].replace(0, np.nan)
-        df.loc[:, 'bb_bandwidth'] = bb_diff / middle_band
+        # 中軌為 0 時頻寬為 NaN，以 np.where 一次完成除法與遮罩
+        if self.with_bandwidth:
+            middle_band = middle.to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                bandwidth = np.where(middle_band != 0, bb_diff / middle_band, np.nan)
+            columns['bb_bandwidth'] = pd.Series(bandwidth, index=df.index)
         
         # Calculate %B
-        price_from_lower = df['close'] - df['bb_lower']
-        band_range = bb_diff.replace(0, np.nan)
-        df.loc[:, 'bb_percent_b'] = price_from_lower / band_range
-        
-        # Handle edge cases for %B
-        df.loc[band_range.isna(), 'bb_percent_b'] = 0.5
-        df.loc[df['bb_percent_b'] > 1, 'bb_percent_b'] = 1
-        df.loc[df['bb_percent_b'] < 0, 'bb_percent_b'] = 0
+        if self.with_percent_b:
+            price_from_lower = (df['close'] - lower).to_numpy()
+            # 帶寬為 0 或 NaN 時 %B 視為 0.5
+            valid_range = ~np.isnan(bb_diff) & (bb_diff != 0)
+            percent_b = np.where(
+                valid_range,
+                price_from_lower / np.where(valid_range, bb_diff, 1.0),
+                0.5
+            )
+            
+            # Handle edge cases for %B：原地處理 NaN/inf 並限制在 [0, 1]
+            np.nan_to_num(percent_b, copy=False, nan=0.5, posinf=1.0, neginf=0.0)
+            np.clip(percent_b, 0.0, 1.0, out=percent_b)
+            columns['bb_percent_b'] = pd.Series(percent_b, index=df.index)
         
-        return df
+        return columns
     
     def get_name(self) -> str:
-        return f"BB_{self.period}_{self.num_std}" 
\ No newline at end of file
+        name = f"BB_{self.period}_{self.num_std}"
+        if self.with_bandwidth:
+            name += "_bw"
+        if self.with_percent_b:
+            name += "_pb"
+        return name 
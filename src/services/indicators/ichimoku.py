@@ -1,5 +1,6 @@
 import pandas as pd
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class Ichimoku(Indicator):
@@ -8,7 +9,7 @@ class Ichimoku(Indicator):
         self.kijun_period = kijun_period
         self.senkou_b_period = senkou_b_period
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         """
         計算一目均衡表（Ichimoku Cloud）的各個組件
         
@@ -21,33 +22,40 @@ class Ichimoku(Indicator):
         
         Returns:
         --------
-        DataFrame with Ichimoku components
+        Dict of Ichimoku components
         """
+        # 滾動最高/最低價使用 TA-Lib 的 MAX/MIN，以單次線性掃描計算
         # 計算轉換線 (Conversion Line，Tenkan-sen)
-        high_tenkan = df['high'].rolling(window=self.tenkan_period).max()
-        low_tenkan = df['low'].rolling(window=self.tenkan_period).min()
-        df['tenkan_sen'] = (high_tenkan + low_tenkan) / 2
+        high_tenkan = talib.MAX(df['high'], timeperiod=self.tenkan_period)
+        low_tenkan = talib.MIN(df['low'], timeperiod=self.tenkan_period)
+        tenkan_sen = (high_tenkan + low_tenkan) / 2
         
         # 計算基準線 (Base Line，Kijun-sen)
-        high_kijun = df['high'].rolling(window=self.kijun_period).max()
-        low_kijun = df['low'].rolling(window=self.kijun_period).min()
-        df['kijun_sen'] = (high_kijun + low_kijun) / 2
+        high_kijun = talib.MAX(df['high'], timeperiod=self.kijun_period)
+        low_kijun = talib.MIN(df['low'], timeperiod=self.kijun_period)
+        kijun_sen = (high_kijun + low_kijun) / 2
         
         # 計算先行帶A (Leading Span A，Senkou Span A)
         # 轉換線和基準線的平均，向前移動26個週期
-        df['senkou_span_a'] = ((df['tenkan_sen'] + df['kijun_sen']) / 2).shift(self.kijun_period)
+        senkou_span_a = ((tenkan_sen + kijun_sen) / 2).shift(self.kijun_period)
         
         # 計算先行帶B (Leading Span B，Senkou Span B)
         # 52週期的最高價和最低價的平均，向前移動26個週期
-        high_senkou = df['high'].rolling(window=self.senkou_b_period).max()
-        low_senkou = df['low'].rolling(window=self.senkou_b_period).min()
-        df['senkou_span_b'] = ((high_senkou + low_senkou) / 2).shift(self.kijun_period)
+        high_senkou = talib.MAX(df['high'], timeperiod=self.senkou_b_period)
+        low_senkou = talib.MIN(df['low'], timeperiod=self.senkou_b_period)
+        senkou_span_b = ((high_senkou + low_senkou) / 2).shift(self.kijun_period)
         
         # 計算延遲線 (Lagging Span，Chikou Span)
         # 當前收盤價向後移動26個週期
-        df['chikou_span'] = df['close'].shift(-self.kijun_period)
-        
-        return df
+        chikou_span = df['close'].shift(-self.kijun_period)
+        
+        return {
+            'tenkan_sen': tenkan_sen,
+            'kijun_sen': kijun_sen,
+            'senkou_span_a': senkou_span_a,
+            'senkou_span_b': senkou_span_b,
+            'chikou_span': chikou_span
+        }
     
     def get_name(self) -> str:
         return f"Ichimoku" 
\ No newline at end of file
@@ -1,11 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import Dict
 import pandas as pd
 
 class Indicator(ABC):
     @abstractmethod
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Compute the indicator columns without modifying ``df``"""
         pass
 
+    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(**self.compute(df))
+
     @abstractmethod
     def get_name(self) -> str:
-        pass 
+        pass
@@ -1,14 +1,14 @@
 import pandas as pd
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class MA(Indicator):
     def __init__(self, period: int = 20):
         self.period = period
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
-        df.loc[:, f'ma_{self.period}'] = talib.SMA(df['close'], timeperiod=self.period)
-        return df
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        return {f'ma_{self.period}': talib.SMA(df['close'], timeperiod=self.period)}
     
     def get_name(self) -> str:
-        return f"MA_{self.period}" 
\ No newline at end of file
+        return f"MA_{self.period}" 
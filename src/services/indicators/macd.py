@@ -1,5 +1,6 @@
 import pandas as pd
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class MACD(Indicator):
@@ -8,17 +9,18 @@ class MACD(Indicator):
         self.slow_period = slow_period
         self.signal_period = signal_period
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         macd, signal, hist = talib.MACD(
             df['close'],
             fastperiod=self.fast_period,
             slowperiod=self.slow_period,
             signalperiod=self.signal_period
         )
-        df.loc[:, 'macd'] = macd
-        df.loc[:, 'macd_signal'] = signal
-        df.loc[:, 'macd_hist'] = hist
-        return df
+        return {
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_hist': hist
+        }
     
     def get_name(self) -> str:
-        return f"MACD_{self.fast_period}_{self.slow_period}_{self.signal_period}" 
\ No newline at end of file
+        return f"MACD_{self.fast_period}_{self.slow_period}_{self.signal_period}" 
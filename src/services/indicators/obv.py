@@ -1,15 +1,19 @@
 import pandas as pd
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class OBV(Indicator):
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
-        df.loc[:, 'obv'] = talib.OBV(df['close'], df['volume'])
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        obv = talib.OBV(df['close'], df['volume'])
         
         # Add OBV EMA for signal line (optional but useful)
-        df.loc[:, 'obv_ema'] = talib.EMA(df['obv'], timeperiod=20)
+        obv_ema = talib.EMA(obv, timeperiod=20)
         
-        return df
+        return {
+            'obv': obv,
+            'obv_ema': obv_ema
+        }
     
     def get_name(self) -> str:
-        return "OBV" 
\ No newline at end of file
+        return "OBV" 
@@ -1,15 +1,14 @@
 import pandas as pd
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class RSI(Indicator):
     def __init__(self, period: int = 14):
         self.period = period
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        df.loc[:, 'rsi'] = talib.RSI(df.loc[:, 'close'], timeperiod=self.period)
-        return df
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        return {'rsi': talib.RSI(df['close'], timeperiod=self.period)}
     
     def get_name(self) -> str:
-        return f"RSI_{self.period}" 
\ No newline at end of file
+        return f"RSI_{self.period}" 
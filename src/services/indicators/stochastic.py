@@ -1,5 +1,6 @@
 import pandas as pd
 import talib
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class Stochastic(Indicator):
@@ -7,7 +8,7 @@ class Stochastic(Indicator):
         self.k_period = k_period
         self.d_period = d_period
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         slowk, slowd = talib.STOCH(
             df['high'],
             df['low'],
@@ -18,9 +19,10 @@ class Stochastic(Indicator):
             slowd_period=self.d_period,
             slowd_matype=0
         )
-        df.loc[:, 'stoch_k'] = slowk
-        df.loc[:, 'stoch_d'] = slowd
-        return df
+        return {
+            'stoch_k': slowk,
+            'stoch_d': slowd
+        }
     
     def get_name(self) -> str:
-        return f"Stochastic_{self.k_period}_{self.d_period}" 
\ No newline at end of file
+        return f"Stochastic_{self.k_period}_{self.d_period}" 
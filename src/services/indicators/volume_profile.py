@@ -1,40 +1,42 @@
 import pandas as pd
 import numpy as np
+from typing import Dict
 from src.services.indicators.indicator import Indicator
 
 class VolumeProfile(Indicator):
     def __init__(self, n_bins: int = 24):
         self.n_bins = n_bins
         
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         """Calculate Volume Profile
         
         Args:
             df: DataFrame with 'high', 'low', 'close', 'volume' columns
             
         Returns:
-            DataFrame with additional volume profile related columns
+            Dict of volume profile related columns
         """
-        # Create a copy of the DataFrame to avoid SettingWithCopyWarning
-        result_df = df.copy()
-        
+        # 直接從輸入的欄位計算，不複製整個 DataFrame
         # Calculate VWAP first, handling zero volume
-        typical_price = (result_df['high'] + result_df['low'] + result_df['close']) / 3
-        volume_non_zero = result_df['volume'].replace(0, np.nan)
-        vwap_temp = typical_price * volume_non_zero
+        typical_price = ((df['high'].to_numpy() + df['low'].to_numpy() + df['close'].to_numpy()) / 3)
+        volume = df['volume'].to_numpy()
+        price_volume = typical_price * volume
         
-        cumsum_volume = volume_non_zero.cumsum()
-        cumsum_vwap = vwap_temp.cumsum()
+        # 零成交量（或無效值）的 K 線不計入累積，該列的 VWAP 直接使用典型價格
+        valid = (volume != 0) & ~np.isnan(price_volume)
+        cumsum_vwap = np.nancumsum(price_volume)
+        cumsum_volume = np.nancumsum(volume)
         
         # Calculate VWAP, handling division by zero
-        result_df.loc[:, 'vwap'] = cumsum_vwap / cumsum_volume
-        
-        # Fill NA values in VWAP with typical price
-        result_df.loc[:, 'vwap'] = result_df['vwap'].fillna(typical_price)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = pd.Series(
+                np.where(valid, cumsum_vwap / cumsum_volume, typical_price),
+                index=df.index
+            )
         
         # Calculate price range for the period
-        price_high = result_df['high'].max()
-        price_low = result_df['low'].min()
+        price_high = df['high'].max()
+        price_low = df['low'].min()
         price_range = price_high - price_low
         
         # Ensure price range is not zero
@@ -43,65 +45,72 @@ class VolumeProfile(Indicator):
         
         # Create price bins
         bin_size = price_range / self.n_bins
-        result_df.loc[:, 'price_bin'] = ((result_df['close'] - price_low) / bin_size).astype(int)
+        # 保留 float64 除法而非乘以倒數，避免邊界價格因捨入誤差落到相鄰區間
+        # 區間編號不超過 n_bins，以 int32 存放即可，減半 bincount 讀取的資料量
+        price_bin = ((df['close'].to_numpy() - price_low) / bin_size).astype(np.int32)
         
         # Ensure price bins are within valid range
-        result_df.loc[:, 'price_bin'] = result_df['price_bin'].clip(0, self.n_bins - 1)
+        np.clip(price_bin, 0, self.n_bins - 1, out=price_bin)
         
-        # Calculate volume profile
-        volume_profile = result_df.groupby('price_bin')['volume'].sum()
+        # NaN 成交量視為 0，與 groupby().sum() 略過 NaN 的行為一致
+        bin_volume = np.where(np.isnan(volume), 0.0, volume)
         
         # Ensure we have at least one bin with volume
-        if len(volume_profile) == 0 or volume_profile.max() == 0:
-            # 如果沒有交易量，使用最中間的價格作為 POC
-            poc_bin = self.n_bins // 2
-            result_df.loc[:, 'poc_price'] = (price_high + price_low) / 2
+        if not bin_volume.any():
+            # 如果沒有交易量，使用最中間的價格作為 POC，價值區為整個價格範圍，不必建立分布
+            poc_price = (price_high + price_low) / 2
+            va_high = price_high
+            va_low = price_low
         else:
+            # Calculate volume profile
+            # 區間編號已在 [0, n_bins) 內，直接以 bincount 加總，沒有成交的價格區間為 0
+            volume_profile = np.bincount(price_bin, weights=bin_volume, minlength=self.n_bins)
+            
             # Find Point of Control (POC) - price level with highest volume
-            poc_bin = volume_profile.idxmax()
-            result_df.loc[:, 'poc_price'] = price_low + (poc_bin + 0.5) * bin_size
-        
-        # Calculate Value Area
-        total_volume = volume_profile.sum()
-        if total_volume == 0:
-            # 如果總交易量為零，使用整個價格範圍
-            result_df.loc[:, 'va_high'] = price_high
-            result_df.loc[:, 'va_low'] = price_low
-            return result_df
+            poc_bin = int(volume_profile.argmax())
+            poc_price = price_low + (poc_bin + 0.5) * bin_size
             
-        volume_sum = volume_profile.get(poc_bin, 0)
-        value_area_bins = {poc_bin}
+            # Calculate Value Area
+            va_low_bin, va_high_bin = self._value_area_bins(volume_profile, poc_bin, volume_profile.sum())
+            va_high = price_low + (va_high_bin + 1) * bin_size
+            va_low = price_low + va_low_bin * bin_size
+        
+        return {
+            'vwap': vwap,
+            'price_bin': pd.Series(price_bin, index=df.index),
+            'poc_price': pd.Series(poc_price, index=df.index),
+            'va_high': pd.Series(va_high, index=df.index),
+            'va_low': pd.Series(va_low, index=df.index)
+        }
+    
+    def _value_area_bins(self, volume_profile: np.ndarray, poc_bin: int, total_volume: float):
+        """Expand from the POC until the value area holds 70% of total volume"""
+        volume_sum = volume_profile[poc_bin]
+        target_volume = 0.7 * total_volume
         
         above_bin = poc_bin
         below_bin = poc_bin
         
         # Expand value area until it contains 70% of total volume
-        while volume_sum < 0.7 * total_volume:
+        # 每一步都取決於兩側下一個區間的大小比較，最多只會迭代 n_bins 次
+        while volume_sum < target_volume:
             above_candidate = above_bin + 1
             below_candidate = below_bin - 1
             
-            volume_above = volume_profile.get(above_candidate, 0)
-            volume_below = volume_profile.get(below_candidate, 0)
+            volume_above = volume_profile[above_candidate] if above_candidate < self.n_bins else 0
+            volume_below = volume_profile[below_candidate] if below_candidate >= 0 else 0
             
             if volume_above > volume_below and above_candidate < self.n_bins:
                 above_bin = above_candidate
-                value_area_bins.add(above_bin)
                 volume_sum += volume_above
             elif below_candidate >= 0:
                 below_bin = below_candidate
-                value_area_bins.add(below_bin)
                 volume_sum += volume_below
             else:
                 break
         
-        # Calculate Value Area High and Low
-        va_high_bin = max(value_area_bins)
-        va_low_bin = min(value_area_bins)
-        
-        result_df.loc[:, 'va_high'] = price_low + (va_high_bin + 1) * bin_size
-        result_df.loc[:, 'va_low'] = price_low + va_low_bin * bin_size
-        
-        return result_df
+        # 價值區只會從 POC 向兩側擴張，因此邊界就是兩側的指標
+        return below_bin, above_bin
     
     def get_name(self) -> str:
         return f"VolumeProfile_{self.n_bins}" 
\ No newline at end of file
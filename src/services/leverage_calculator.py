@@ -1,6 +1,28 @@
 from dataclasses import dataclass
+from functools import cached_property
+from bisect import bisect_left
 from typing import Optional
-import math
+
+# 分段函數的門檻與係數：第 i 段適用於 門檻[i-1] < x <= 門檻[i]，最後一段為超出所有門檻
+# 風險分數 = 基準 + 斜率 * (波動率 - 起點)，最低 0.1
+RISK_THRESHOLDS = (0.005, 0.02, 0.05, 0.10)
+RISK_SEGMENTS = (
+    (1.0, 0.0, 0.0),      # 穩定幣
+    (0.9, -20.0, 0.005),  # 低波動（主流幣穩定期）
+    (0.7, -10.0, 0.02),   # 中等波動（主流幣波動期）
+    (0.4, -4.0, 0.05),    # 高波動（小市值幣）
+    (0.2, -2.0, 0.10)     # 極端波動
+)
+
+# 槓桿 = min + range * (起始比例 + 區間比例 * (分數 - 起點) / 0.2)
+LEVERAGE_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+LEVERAGE_SEGMENTS = (
+    (0.0, 0.0, 0.0),  # 0-0.2 分數使用最低槓桿
+    (0.0, 0.2, 0.2),  # 0.2-0.4 分數使用 min 到 min + 20% 範圍
+    (0.2, 0.3, 0.4),  # 0.4-0.6 分數使用 min + 20% 到 min + 50% 範圍
+    (0.5, 0.3, 0.6),  # 0.6-0.8 分數使用 min + 50% 到 min + 80% 範圍
+    (0.8, 0.2, 0.8)   # 0.8-1.0 分數使用 min + 80% 到 max 範圍
+)
 
 @dataclass
 class LeverageInfo:
@@ -8,8 +30,22 @@ class LeverageInfo:
     suggested_leverage: int    # 建議槓桿倍數
     max_leverage: int         # 最大可用槓桿
     risk_level: str           # 風險等級：'low', 'medium', 'high'
-    description: str          # 說明
     score_details: dict       # 詳細評分數據
+    # 產生說明所需的原始數值
+    min_leverage: int         # 最小槓桿
+    relative_level: float     # 相對槓桿水平
+    volatility: float         # 波動率
+    trend_strength: float     # 趨勢強度
+    
+    @cached_property
+    def description(self) -> str:
+        """說明，多數呼叫端只需要槓桿倍數，因此第一次讀取時才格式化"""
+        return (
+            f"建議槓桿：{self.suggested_leverage}x（範圍：{self.min_leverage}x-{self.max_leverage}x）\n"
+            f"風險等級：{self.risk_level}（相對水平：{self.relative_level:.1%}）\n"
+            f"波動率：{self.volatility:.1%}\n"
+            f"趨勢強度：{self.trend_strength:.1%}\n"
+        )
 
 class LeverageCalculator:
     """槓桿計算器"""
@@ -41,16 +77,9 @@ class LeverageCalculator:
         Returns:
             0-1 之間的分數
         """
-        if volatility <= 0.005:  # 穩定幣
-            return 1.0
-        elif volatility <= 0.02:  # 低波動（主流幣穩定期）
-            return 0.9 - (volatility - 0.005) * 20
-        elif volatility <= 0.05:  # 中等波動（主流幣波動期）
-            return 0.7 - (volatility - 0.02) * 10
-        elif volatility <= 0.10:  # 高波動（小市值幣）
-            return 0.4 - (volatility - 0.05) * 4
-        else:  # 極端波動
-            return max(0.1, 0.2 - (volatility - 0.10) * 2)
+        # 以二分搜尋找出所在區段，取代逐一比較門檻
+        base, slope, start = RISK_SEGMENTS[bisect_left(RISK_THRESHOLDS, volatility)]
+        return max(0.1, base + slope * (volatility - start))
     
     def _calculate_trend_score(self, trend_strength: float) -> float:
         """計算趨勢分數
@@ -75,25 +104,11 @@ class LeverageCalculator:
             建議槓桿倍數
         """
         # 基礎槓桿計算
-        if composite_score <= 0.2:
-            # 0-0.2 分數使用最低槓桿
+        if composite_score <= LEVERAGE_THRESHOLDS[0]:
             return self.min_leverage
-        elif composite_score <= 0.4:
-            # 0.2-0.4 分數使用 min 到 min + 20% 範圍
-            ratio = (composite_score - 0.2) / 0.2
-            return self.min_leverage + self.leverage_range * 0.2 * ratio
-        elif composite_score <= 0.6:
-            # 0.4-0.6 分數使用 min + 20% 到 min + 50% 範圍
-            ratio = (composite_score - 0.4) / 0.2
-            return self.min_leverage + self.leverage_range * (0.2 + 0.3 * ratio)
-        elif composite_score <= 0.8:
-            # 0.6-0.8 分數使用 min + 50% 到 min + 80% 範圍
-            ratio = (composite_score - 0.6) / 0.2
-            return self.min_leverage + self.leverage_range * (0.5 + 0.3 * ratio)
-        else:
-            # 0.8-1.0 分數使用 min + 80% 到 max 範圍
-            ratio = (composite_score - 0.8) / 0.2
-            return self.min_leverage + self.leverage_range * (0.8 + 0.2 * ratio)
+        offset, span, start = LEVERAGE_SEGMENTS[bisect_left(LEVERAGE_THRESHOLDS, composite_score)]
+        ratio = (composite_score - start) / 0.2
+        return self.min_leverage + self.leverage_range * (offset + span * ratio)
     
     def calculate(self, volatility: float, trend_strength: float) -> LeverageInfo:
         """計算建議槓桿倍數
@@ -142,22 +157,13 @@ class LeverageCalculator:
             'composite_score': round(composite_score, 3)
         }
         
-        # 8. 生成說明
-        description = (
-            f"建議槓桿：{final_leverage}x（範圍：{self.min_leverage}x-{self.max_leverage}x）\n"
-            f"風險等級：{risk_level}（相對水平：{relative_level:.1%}）\n"
-            f"波動率：{volatility:.1%}\n"
-            f"趨勢強度：{trend_strength:.1%}\n"
-            # f"風險評分：{risk_score:.3f}\n"
-            # f"趨勢評分：{trend_score:.3f}\n"
-            # f"綜合評分：{composite_score:.3f}\n"
-            # f"風險提示：{risk_description}"
-        )
-        
         return LeverageInfo(
             suggested_leverage=final_leverage,
             max_leverage=self.max_leverage,
             risk_level=risk_level,
-            description=description,
-            score_details=score_details
+            score_details=score_details,
+            min_leverage=self.min_leverage,
+            relative_level=relative_level,
+            volatility=volatility,
+            trend_strength=trend_strength
         )
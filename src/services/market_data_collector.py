@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
 from src.utils.clients.binance_client import BinanceClient
@@ -15,12 +16,16 @@ class MarketDataCollector:
     
     def collect_and_store(self) -> None:
         """Collect market data from Binance and store it in the file"""
-        # 從 Binance 獲取市場資料並儲存到檔案
-        market_models = self.binance_client.fetch_markets()
-        self.market_store.save(market_models)
+        # 兩個來源互不相依，以執行緒同時抓取，總耗時取兩者中較長者
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            markets_future = executor.submit(self.binance_client.fetch_markets)
+            market_caps_future = executor.submit(self.coin_market_cap_client.fetch_market_caps)
+            # 任一來源失敗時直接拋回呼叫端，兩份檔案都不寫入，避免存到不同時間點的快照
+            market_models = markets_future.result()
+            market_cap_models = market_caps_future.result()
 
-        # 從 CoinMarketCap 獲取市場資料並儲存到檔案
-        market_cap_models = self.coin_market_cap_client.fetch_market_caps()
+        # 兩份資料都取得後才儲存到檔案
+        self.market_store.save(market_models)
         self.market_store.save_market_caps(market_cap_models)
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import os
 import pandas as pd
+from tqdm import tqdm
 import talib
 import numpy as np
 
@@ -12,6 +15,7 @@ from src.services.indicators.macd import MACD
 from src.services.indicators.bollinger_bands import BollingerBands
 from src.services.indicators.ichimoku import Ichimoku
 from src.services.leverage_calculator import LeverageCalculator
+from src.utils.logging import setup_logging
 
 class SwapAnalyzerV2:
     def __init__(self):
@@ -25,181 +29,179 @@ class SwapAnalyzerV2:
         ]
 
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
-        # 計算所有指標
+        # 計算所有指標，並一次性合併到 DataFrame
+        columns = {}
         for indicator in self.indicators:
-            df = indicator.calculate(df)
+            columns.update(indicator.compute(df))
         
+        # 趨勢判斷用的均線只需整欄計算一次
+        close = df['close'].to_numpy()
+        for period in (10, 30, 60):
+            columns[f'ma{period}'] = pd.Series(talib.SMA(close, timeperiod=period), index=df.index)
+
         """計算市場波動性指標，用於動態調整參數"""
         # 計算過去20天的波動率
-        df.loc[:, 'returns'] = df['close'].pct_change()
-        df.loc[:, 'volatility'] = df['returns'].rolling(window=20).std() * np.sqrt(365)
+        # TA-Lib 的 STDDEV 為母體標準差，乘上 sqrt(n/(n-1)) 換算成與 pandas rolling std 相同的樣本標準差
+        # 報酬率直接以陣列計算，第一筆沒有前值為 NaN，與 pct_change 相同
+        returns = np.empty_like(close)
+        returns[:1] = np.nan
+        np.divide(close[1:], close[:-1], out=returns[1:])
+        returns[1:] -= 1
+        volatility = talib.STDDEV(returns, timeperiod=20, nbdev=1) * np.sqrt(20 / 19) * np.sqrt(365)
         
         # 計算過去7天的平均成交量相對於30天的變化
-        df.loc[:, 'vol_ma7'] = df['volume'].rolling(window=7).mean()
-        df.loc[:, 'vol_ma30'] = df['volume'].rolling(window=30).mean()
-        df.loc[:, 'volume_ratio'] = df['vol_ma7'] / df['vol_ma30']
+        volume = df['volume'].to_numpy()
+        vol_ma7 = talib.SMA(volume, timeperiod=7)
+        vol_ma30 = talib.SMA(volume, timeperiod=30)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = vol_ma7 / vol_ma30
         
-        return df
+        columns.update(
+            returns=pd.Series(returns, index=df.index),
+            volatility=pd.Series(volatility, index=df.index),
+            vol_ma7=pd.Series(vol_ma7, index=df.index),
+            vol_ma30=pd.Series(vol_ma30, index=df.index),
+            volume_ratio=pd.Series(volume_ratio, index=df.index)
+        )
+        return df.assign(**columns)
 
     def analyze_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """分析交易信號"""
-        df.loc[:, 'signal'] = 0  # 1: 做多, -1: 做空, 0: 觀望
-        df.loc[:, 'confidence'] = 0.0  # 信心水平 1-5
-        df.loc[:, 'suggested_leverage'] = 0.0  # 修改為浮點數
-        df.loc[:, 'stop_loss_pct'] = 0.0
+        # 以整欄陣列運算取代逐列迴圈，結果與逐列計算相同
+        # 獲取當前市場狀態
+        current_vol = df['volatility'].to_numpy()
+        volume_ratio = df['volume_ratio'].to_numpy()
+        atr_pct = df['atr_pct'].to_numpy()
+        
+        # 根據波動性動態調整 RSI 閾值
+        rsi_thresholds = self.get_dynamic_rsi_thresholds(current_vol)
+        
+        # 計算綜合信號
+        signals = {
+            'trend': self.analyze_trend(df),
+            'momentum': self.analyze_momentum(df, rsi_thresholds),
+            'volatility': self.analyze_volatility(df),
+            'volume': self.analyze_volume(df)
+        }
+        
+        # 根據市場狀態計算建議
+        advice = self.calculate_trading_advice(df, signals, current_vol, volume_ratio, atr_pct)
+        
+        # 跳過前面無法計算的數據
+        skip = min(52, len(df))
+        for values in advice.values():
+            values[:skip] = 0
+        
+        df['signal'] = advice['signal']  # 1: 做多, -1: 做空, 0: 觀望
+        df['confidence'] = advice['confidence']  # 信心水平 1-5
+        df['suggested_leverage'] = advice['suggested_leverage']
+        df['stop_loss_pct'] = advice['stop_loss_pct']
         
-        for i in range(len(df)):
-            if i < 52:  # 跳過前面無法計算的數據
-                continue
-                
-            # 獲取當前市場狀態
-            current_vol = df['volatility'].iloc[i]
-            volume_ratio = df['volume_ratio'].iloc[i]
-            atr_pct = df['atr_pct'].iloc[i]
-            
-            # 根據波動性動態調整 RSI 閾值
-            rsi_thresholds = self.get_dynamic_rsi_thresholds(current_vol)
-            
-            # 計算綜合信號
-            signals = {
-                'trend': self.analyze_trend(df, i),
-                'momentum': self.analyze_momentum(df, i, rsi_thresholds),
-                'volatility': self.analyze_volatility(df, i),
-                'volume': self.analyze_volume(df, i)
-            }
-            
-            # 根據市場狀態計算建議
-            self.calculate_trading_advice(df, i, signals, current_vol, volume_ratio, atr_pct)
-            
         return df
 
-    def get_dynamic_rsi_thresholds(self, volatility: float) -> Dict[str, float]:
+    def get_dynamic_rsi_thresholds(self, volatility: np.ndarray) -> Dict[str, np.ndarray]:
         """根據波動率動態調整 RSI 閾值"""
         # 高波動時期放寬 RSI 的超買超賣判斷
         base_oversold = 30
         base_overbought = 70
         
-        if volatility > 1.0:  # 年化波動率超過100%
-            return {
-                'oversold': base_oversold - 10,
-                'overbought': base_overbought + 10
-            }
-        elif volatility > 0.5:  # 年化波動率超過50%
-            return {
-                'oversold': base_oversold - 5,
-                'overbought': base_overbought + 5
-            }
-        else:
-            return {
-                'oversold': base_oversold,
-                'overbought': base_overbought
-            }
+        # 年化波動率超過100% 放寬 10，超過50% 放寬 5
+        widen = np.select([volatility > 1.0, volatility > 0.5], [10, 5], 0)
+        return {
+            'oversold': base_oversold - widen,
+            'overbought': base_overbought + widen
+        }
 
-    def analyze_trend(self, df: pd.DataFrame, index: int):
+    def analyze_trend(self, df: pd.DataFrame) -> np.ndarray:
         """分析趨勢強度"""
-        close = df['close'].iloc[index]
-        
-        # 價格相對於均線位置
-        ma_short = talib.SMA(df['close'], timeperiod=10).iloc[index]
-        ma_mid = talib.SMA(df['close'], timeperiod=30).iloc[index]
-        ma_long = talib.SMA(df['close'], timeperiod=60).iloc[index]
+        close = df['close'].to_numpy()
         
-        trend_score = 0
+        # 價格相對於均線位置，均線已在 calculate 中計算
+        ma_short = df['ma10'].to_numpy()
+        ma_mid = df['ma30'].to_numpy()
+        ma_long = df['ma60'].to_numpy()
         
-        # 多頭排列
-        if close > ma_short > ma_mid > ma_long:
-            trend_score = 2
-        # 空頭排列
-        elif close < ma_short < ma_mid < ma_long:
-            trend_score = -2
-        # 部分多頭
-        elif close > ma_mid:
-            trend_score = 1
-        # 部分空頭
-        elif close < ma_mid:
-            trend_score = -1
-            
-        return trend_score
+        return np.select(
+            [
+                (close > ma_short) & (ma_short > ma_mid) & (ma_mid > ma_long),  # 多頭排列
+                (close < ma_short) & (ma_short < ma_mid) & (ma_mid < ma_long),  # 空頭排列
+                close > ma_mid,  # 部分多頭
+                close < ma_mid   # 部分空頭
+            ],
+            [2, -2, 1, -1],
+            0
+        )
 
-    def analyze_momentum(self, df: pd.DataFrame, index: int, rsi_thresholds):
+    def analyze_momentum(self, df: pd.DataFrame, rsi_thresholds) -> np.ndarray:
         """分析動能"""
-        momentum_score = 0
-        
         # RSI
-        rsi = df['rsi'].iloc[index]
-        if rsi < rsi_thresholds['oversold']:
-            momentum_score += 1
-        elif rsi > rsi_thresholds['overbought']:
-            momentum_score -= 1
-            
-        # MACD
-        if df['macd'].iloc[index] > df['macd_signal'].iloc[index]:
-            momentum_score += 1
-        else:
-            momentum_score -= 1
-            
+        rsi = df['rsi'].to_numpy()
+        momentum_score = (
+            (rsi < rsi_thresholds['oversold']).astype(int)
+            - (rsi > rsi_thresholds['overbought']).astype(int)
+        )
+        
+        # MACD：柱狀圖即 MACD 與信號線的差，大於 0 代表 MACD 在信號線之上
+        momentum_score += np.where(df['macd_hist'].to_numpy() > 0, 1, -1)
+        
         return momentum_score
 
-    def analyze_volatility(self, df: pd.DataFrame, index: int):
+    def analyze_volatility(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
         """分析波動性"""
-        bb_width = (df['bb_upper'].iloc[index] - df['bb_lower'].iloc[index]) / df['bb_middle'].iloc[index]
-        atr_pct = df['atr_pct'].iloc[index]
+        atr_pct = df['atr_pct'].to_numpy()
         
-        # 回傳波動性評分和建議的倉位大小
-        if atr_pct > 5:  # 極高波動
-            return {'score': 0, 'position_size': 0.3}
-        elif atr_pct > 3:  # 高波動
-            return {'score': 1, 'position_size': 0.5}
-        else:  # 正常波動
-            return {'score': 2, 'position_size': 1.0}
+        # 回傳波動性評分和建議的倉位大小：極高波動、高波動、正常波動
+        conditions = [atr_pct > 5, atr_pct > 3]
+        return {
+            'score': np.select(conditions, [0, 1], 2),
+            'position_size': np.select(conditions, [0.3, 0.5], 1.0)
+        }
 
-    def analyze_volume(self, df: pd.DataFrame, index: int):
+    def analyze_volume(self, df: pd.DataFrame) -> np.ndarray:
         """分析成交量"""
-        volume_ratio = df['volume_ratio'].iloc[index]
+        volume_ratio = df['volume_ratio'].to_numpy()
         
-        if volume_ratio > 1.5:  # 成交量明顯放大
-            return 2
-        elif volume_ratio > 1.2:  # 成交量略微放大
-            return 1
-        elif volume_ratio < 0.8:  # 成交量萎縮
-            return -1
-        else:
-            return 0
+        return np.select(
+            [
+                volume_ratio > 1.5,  # 成交量明顯放大
+                volume_ratio > 1.2,  # 成交量略微放大
+                volume_ratio < 0.8   # 成交量萎縮
+            ],
+            [2, 1, -1],
+            0
+        )
 
-    def calculate_trading_advice(self, df: pd.DataFrame, index: int, signals, volatility, volume_ratio, atr_pct):
+    def calculate_trading_advice(self, df: pd.DataFrame, signals, volatility, volume_ratio, atr_pct) -> Dict[str, np.ndarray]:
         """計算綜合建議"""
         # 計算各個指標的權重分數 (0-1)
         
         # 1. 趨勢得分 (0-1)
-        trend_score = abs(signals['trend']) / 2  # 原始範圍 -2 到 2
+        trend_score = np.abs(signals['trend']) / 2  # 原始範圍 -2 到 2
         
         # 2. 動能得分 (0-1)
-        momentum_score = (abs(signals['momentum']) / 2)  # 原始範圍 -2 到 2
+        momentum_score = (np.abs(signals['momentum']) / 2)  # 原始範圍 -2 到 2
         
         # 3. 波動性得分 (0-1)
         volatility_score = signals['volatility']['score'] / 2  # 原始範圍 0 到 2
         
         # 4. 成交量得分 (0-1)
-        volume_score = (abs(signals['volume']) / 2)  # 原始範圍 -2 到 2
+        volume_score = (np.abs(signals['volume']) / 2)  # 原始範圍 -2 到 2
         
         # 5. 布林帶位置得分 (0-1)
-        current_price = df['close'].iloc[index]
-        bb_upper = df['bb_upper'].iloc[index]
-        bb_lower = df['bb_lower'].iloc[index]
-        bb_position = (current_price - bb_lower) / (bb_upper - bb_lower)
-        bb_score = 1 - abs(0.5 - bb_position)  # 越接近中軌分數越高
+        current_price = df['close'].to_numpy()
+        bb_upper = df['bb_upper'].to_numpy()
+        bb_lower = df['bb_lower'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_position = (current_price - bb_lower) / (bb_upper - bb_lower)
+        bb_score = 1 - np.abs(0.5 - bb_position)  # 越接近中軌分數越高
         
         # 6. 計算 RSI 的極值程度 (0-1)
-        rsi = df['rsi'].iloc[index]
-        rsi_score = 0
-        if rsi <= 30:
-            rsi_score = (30 - rsi) / 30
-        elif rsi >= 70:
-            rsi_score = (rsi - 70) / 30
-            
+        rsi = df['rsi'].to_numpy()
+        rsi_score = np.select([rsi <= 30, rsi >= 70], [(30 - rsi) / 30, (rsi - 70) / 30], 0)
+        
         # 7. 計算 MACD 的背離程度 (0-1)
-        macd_diff = abs(df['macd'].iloc[index] - df['macd_signal'].iloc[index])
-        macd_score = min(macd_diff / df['close'].iloc[index] * 100, 1)
+        macd_diff = np.abs(df['macd_hist'].to_numpy())
+        macd_score = np.minimum(macd_diff / current_price * 100, 1)
         
         # 權重配置
         weights = {
@@ -224,54 +226,43 @@ class SwapAnalyzerV2:
         )
         
         # 市場條件懲罰因子 (0.5-1)
-        market_penalty = 1.0
-        if volatility > 0.8:  # 高波動懲罰
-            market_penalty *= 0.8
-        if volume_ratio < 0.8:  # 低成交量懲罰
-            market_penalty *= 0.9
-        if atr_pct > 5:  # 高 ATR 懲罰
-            market_penalty *= 0.8
+        market_penalty = np.ones(len(df))
+        market_penalty[volatility > 0.8] *= 0.8  # 高波動懲罰
+        market_penalty[volume_ratio < 0.8] *= 0.9  # 低成交量懲罰
+        market_penalty[atr_pct > 5] *= 0.8  # 高 ATR 懲罰
             
         # 最終信心分數 (0-1)
         final_confidence = weighted_score * market_penalty
         
         # 設置信號和建議
         signal_threshold = 0.6  # 需要較高的信心度才發出信號
-        if weighted_score >= signal_threshold:
-            if signals['trend'] > 0:  # 做多信號
-                df.loc[df.index[index], 'signal'] = 1
-            else:  # 做空信號
-                df.loc[df.index[index], 'signal'] = -1
-        else:
-            df.loc[df.index[index], 'signal'] = 0
-            
-        df.loc[df.index[index], 'confidence'] = final_confidence
-        
-        # 根據信心度調整槓桿
-        base_leverage = self.calculate_base_leverage(volatility)
-        df.loc[df.index[index], 'suggested_leverage'] = base_leverage * final_confidence
+        # 做多信號、做空信號，否則觀望
+        signal = np.where(
+            weighted_score >= signal_threshold,
+            np.where(signals['trend'] > 0, 1, -1),
+            0
+        )
         
-        # 設置動態止損
-        df.loc[df.index[index], 'stop_loss_pct'] = self.calculate_stop_loss(atr_pct)
+        # 根據信心度調整槓桿，並設置動態止損
+        return {
+            'signal': signal,
+            'confidence': final_confidence,
+            'suggested_leverage': self.calculate_base_leverage(volatility) * final_confidence,
+            'stop_loss_pct': self.calculate_stop_loss(atr_pct)
+        }
 
-    def calculate_base_leverage(self, volatility):
+    def calculate_base_leverage(self, volatility: np.ndarray) -> np.ndarray:
         """根據波動率計算建議槓桿"""
-        if volatility > 1.0:  # 極高波動
-            return 1
-        elif volatility > 0.7:  # 高波動
-            return 2
-        elif volatility > 0.4:  # 中等波動
-            return 3
-        else:  # 低波動
-            return 4
+        # 極高波動、高波動、中等波動，其餘為低波動
+        return np.select([volatility > 1.0, volatility > 0.7, volatility > 0.4], [1, 2, 3], 4)
 
-    def calculate_stop_loss(self, atr_pct):
+    def calculate_stop_loss(self, atr_pct: np.ndarray) -> np.ndarray:
         """計算動態止損點"""
         # 根據ATR設置止損
         base_stop = atr_pct * 1.5  # 基礎止損為1.5倍ATR
         
         # 限制止損範圍
-        return min(max(base_stop, 2), 10)  # 最小2%，最大10%
+        return np.clip(base_stop, 2, 10)  # 最小2%，最大10%
 
     def get_trading_advice(self, df: pd.DataFrame, index: int = -1):
         """獲取交易建議"""
@@ -302,4 +293,48 @@ class SwapAnalyzerV2:
                 'reason': '無明確信號或波動過大'
             })
             
-        return advice
\ No newline at end of file
+        return advice
+
+# 每個工作進程只建立一次分析器
+_worker_analyzer: Optional[SwapAnalyzerV2] = None
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = SwapAnalyzerV2()
+
+def _worker(item: Tuple[str, pd.DataFrame]):
+    symbol, df = item
+    try:
+        # 只回傳最新一列，減少傳回主進程的資料量
+        return _worker_analyzer.analyze_signals(_worker_analyzer.calculate(df)).iloc[-1]
+    except Exception as e:
+        return e
+
+def analyze_symbols(
+    payloads: List[Tuple[str, pd.DataFrame]],
+    max_workers: Optional[int] = None,
+    desc: str = "Analyzing Markets"
+) -> List[Tuple[str, pd.Series]]:
+    """Analyze (symbol, df) payloads in parallel and return each symbol's latest row, skipping symbols that fail"""
+    if not payloads:
+        return []
+        
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(payloads) // (4 * workers))
+    
+    logger = setup_logging(__name__)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        progress = tqdm(
+            zip(payloads, executor.map(_worker, payloads, chunksize=chunksize)),
+            total=len(payloads),
+            desc=desc,
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}]",
+        )
+        for (symbol, _), result in progress:
+            if isinstance(result, Exception):
+                logger.warning(f"分析 {symbol} 時發生錯誤: {str(result)}")
+                continue
+            results.append((symbol, result))
+            
+    return results
@@ -1,8 +1,14 @@
 import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import ccxt
+import ccxt.async_support as ccxt_async
 from dotenv import load_dotenv
+from tqdm import tqdm
 from pprint import pprint
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Tuple, Union
 from src.utils.logging import setup_logging
 from src.models.market_model import MarketModel
 from datetime import datetime
@@ -22,99 +28,125 @@ class Timeframe(str, Enum):
     # Days
     DAY_1 = '1d'
 
+# 定義穩定幣列表，模組層級的 frozenset 只建立一次，所有實例共用
+STABLECOINS = frozenset({
+    # USD Stablecoins - Major
+    'USD',
+    'USDT',     # Tether
+    'USDC',     # USD Coin
+    'BUSD',     # Binance USD
+    'DAI',      # Dai
+    'TUSD',     # TrueUSD
+    'USDP',     # Pax Dollar (formerly PAX)
+    'USDD',     # USDD
+    'UST',      # TerraUSD Classic
+    
+    # USD Stablecoins - Others
+    'GUSD',     # Gemini Dollar
+    'LUSD',     # Liquity USD
+    'FRAX',     # Frax
+    'SUSD',     # Synthetix USD
+    'CUSD',     # Celo Dollar
+    'USDN',     # Neutrino USD
+    'MUSD',     # mStable USD
+    'HUSD',     # HUSD
+    'OUSD',     # Origin Dollar
+    'USDX',     # USDX
+    'USDK',     # USDK
+    'DOLA',     # Dola USD
+    'YUSD',     # YUSD Stablecoin
+    'ZUSD',     # ZUSD
+    'USDH',     # USDH
+    'USDB',     # USD Balance
+    'USDS',     # Stably USD
+    'USDJ',     # JUST Stablecoin
+    'USDL',     # USDL
+    'RSV',      # Reserve
+    'USDEX',    # USDEX
+    'USDF',     # USD Freedom
+    'DUSD',     # Decentralized USD
+    
+    # EUR Stablecoins
+    'EURS',     # STASIS EURO
+    'EURT',     # Tether EURt
+    'JEUR',     # Jarvis Synthetic Euro
+    'SEUR',     # Stasis SEuro
+    'CEUR',     # Celo Euro
+    'EUROC',    # Euro Coin
+    
+    # GBP Stablecoins
+    'GBPT',     # Tether GBPt
+    'GBPP',     # Poundtoken
+    'TGBP',     # TrueGBP
+    
+    # Other Fiat Stablecoins
+    'CADC',     # CAD Coin
+    'XIDR',     # XIDR (Indonesian Rupiah)
+    'BIDR',     # BIDR (Binance IDR)
+    'AUDT',     # AUD Tether
+    'CNHT',     # CNH Tether
+    'XSGD',     # XSGD (Singapore Dollar)
+    'NZDS',     # NZD Stablecoin
+    'TRYB',     # BiLira
+    'BRZC',     # Brazilian Digital Token
+    'JPYC',     # JPY Coin
+    'THBT',     # Thai Baht Digital
+    'MXNT',     # Mexican Peso Tether
+    
+    # Commodity-Backed Stablecoins
+    'XAUT',     # Tether Gold
+    'PAXG',     # PAX Gold
+    'DGLD',     # Digital Gold
+    
+    # Algorithmic Stablecoins
+    'AMPL',     # Ampleforth
+    'BAC',      # Basis Cash
+    'FEI',      # Fei USD
+    'FLOAT',    # Float Protocol
+    'RAI',      # Rai Reflex Index
+    'USDV',     # USD Velocity
+    'VOLT',     # Voltage Protocol
+    
+    # Yield-Bearing Stablecoins
+    'ALUSD',    # Alchemix USD
+    # yUSD、Synth sUSD、mStable USD、Origin USD 已列於上方（YUSD、SUSD、MUSD、OUSD）
+    
+    # Deprecated but might still exist in some pairs
+    'SAI',      # Single Collateral DAI (old)
+    'USDT_OLD', # Old USDT contract
+    'sUSD',     # Synthetix USD (old format)
+    'BUSD_OLD'  # Old BUSD contract
+})
+
+# 允許的報價貨幣
+QUOTES = frozenset({'USDT'})
+
 class BinanceClient:
-    # 定義穩定幣列表
-    STABLECOINS = {
-        # USD Stablecoins - Major
-        'USD',
-        'USDT',     # Tether
-        'USDC',     # USD Coin
-        'BUSD',     # Binance USD
-        'DAI',      # Dai
-        'TUSD',     # TrueUSD
-        'USDP',     # Pax Dollar (formerly PAX)
-        'USDD',     # USDD
-        'UST',      # TerraUSD Classic
-        
-        # USD Stablecoins - Others
-        'GUSD',     # Gemini Dollar
-        'LUSD',     # Liquity USD
-        'FRAX',     # Frax
-        'SUSD',     # Synthetix USD
-        'CUSD',     # Celo Dollar
-        'USDN',     # Neutrino USD
-        'MUSD',     # mStable USD
-        'HUSD',     # HUSD
-        'OUSD',     # Origin Dollar
-        'USDX',     # USDX
-        'USDK',     # USDK
-        'DOLA',     # Dola USD
-        'YUSD',     # YUSD Stablecoin
-        'ZUSD',     # ZUSD
-        'USDH',     # USDH
-        'USDB',     # USD Balance
-        'USDS',     # Stably USD
-        'USDJ',     # JUST Stablecoin
-        'USDL',     # USDL
-        'RSV',      # Reserve
-        'USDEX',    # USDEX
-        'USDF',     # USD Freedom
-        'DUSD',     # Decentralized USD
-        
-        # EUR Stablecoins
-        'EURS',     # STASIS EURO
-        'EURT',     # Tether EURt
-        'JEUR',     # Jarvis Synthetic Euro
-        'SEUR',     # Stasis SEuro
-        'CEUR',     # Celo Euro
-        'EUROC',    # Euro Coin
-        
-        # GBP Stablecoins
-        'GBPT',     # Tether GBPt
-        'GBPP',     # Poundtoken
-        'TGBP',     # TrueGBP
-        
-        # Other Fiat Stablecoins
-        'CADC',     # CAD Coin
-        'XIDR',     # XIDR (Indonesian Rupiah)
-        'BIDR',     # BIDR (Binance IDR)
-        'AUDT',     # AUD Tether
-        'CNHT',     # CNH Tether
-        'XSGD',     # XSGD (Singapore Dollar)
-        'NZDS',     # NZD Stablecoin
-        'TRYB',     # BiLira
-        'BRZC',     # Brazilian Digital Token
-        'JPYC',     # JPY Coin
-        'THBT',     # Thai Baht Digital
-        'MXNT',     # Mexican Peso Tether
-        
-        # Commodity-Backed Stablecoins
-        'XAUT',     # Tether Gold
-        'PAXG',     # PAX Gold
-        'DGLD',     # Digital Gold
-        
-        # Algorithmic Stablecoins
-        'AMPL',     # Ampleforth
-        'BAC',      # Basis Cash
-        'FEI',      # Fei USD
-        'FLOAT',    # Float Protocol
-        'RAI',      # Rai Reflex Index
-        'USDV',     # USD Velocity
-        'VOLT',     # Voltage Protocol
-        
-        # Yield-Bearing Stablecoins
-        'ALUSD',    # Alchemix USD
-        'YUSD',     # yUSD
-        'SUSD',     # Synth sUSD
-        'MUSD',     # mStable USD
-        'OUSD',     # Origin USD
-        
-        # Deprecated but might still exist in some pairs
-        'SAI',      # Single Collateral DAI (old)
-        'USDT_OLD', # Old USDT contract
-        'sUSD',     # Synthetix USD (old format)
-        'BUSD_OLD'  # Old BUSD contract
-    }
+    # 保留類別屬性，讓既有的 BinanceClient.STABLECOINS 用法不受影響
+    STABLECOINS = STABLECOINS
+    QUOTES = QUOTES
+
+    # 市場列表很少變動，超過此秒數才重新向交易所請求
+    MARKETS_TTL = 3600
+
+    # 同一進程內使用相同憑證的 BinanceClient 共用交易所實例，保留 keep-alive 連線與已載入的市場列表
+    _clients: Dict[Tuple[Optional[str], Optional[str]], Tuple[ccxt.Exchange, ccxt.Exchange]] = {}
+    _clients_lock = threading.Lock()
+    _markets_loaded_at: Dict[Tuple[Tuple[Optional[str], Optional[str]], MarketType], float] = {}
+
+    @staticmethod
+    def _credentials(auth_config: Dict) -> Tuple[Optional[str], Optional[str]]:
+        return auth_config.get('apiKey'), auth_config.get('secret')
+
+    @classmethod
+    def _get_clients(cls, auth_config: Dict) -> Tuple[ccxt.Exchange, ccxt.Exchange]:
+        """取得共用的現貨與合約交易所實例，依憑證區分，第一次呼叫時才建立"""
+        key = cls._credentials(auth_config)
+        with cls._clients_lock:
+            clients = cls._clients.get(key)
+            if clients is None:
+                clients = cls._clients[key] = (ccxt.binance(auth_config), ccxt.binanceusdm(auth_config))
+            return clients
 
     def __init__(self):
         load_dotenv()
@@ -124,8 +156,8 @@ class BinanceClient:
             'enableRateLimit': True,
         }
         self.logger = setup_logging(__name__)
-        self.spot_client = ccxt.binance(auth_config)
-        self.swap_client = ccxt.binanceusdm(auth_config)
+        self.auth_config = auth_config
+        self.spot_client, self.swap_client = self._get_clients(auth_config)
 
     def fetch_markets(self, market_types: List[MarketType] = [MarketType.SPOT, MarketType.SWAP]) -> List[MarketModel]:
         """獲取指定市場類型的非穩定幣交易對資訊
@@ -143,32 +175,39 @@ class BinanceClient:
             
         all_markets = {}  # 使用字典來儲存市場資料，以 symbol 為 key
         
-        for market_type in market_types:
-            try:
+        # 各市場類型的 load_markets 是互不相依的 HTTPS 請求，同時送出；結果仍依 market_types 順序處理
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {}
+            for market_type in market_types:
                 exchange_class = self.spot_client if market_type == MarketType.SPOT else self.swap_client
                 self.logger.info(f"正在獲取 {market_type.value} 市場資料...")
-                markets = exchange_class.load_markets()
+                futures[market_type] = executor.submit(self._load_markets, market_type, exchange_class)
+        
+        for market_type in market_types:
+            try:
+                markets = futures[market_type].result()
                 self.logger.info(f"已獲取到 {len(markets)} 個原始市場")
                 
+                # 市場類型的判斷在迴圈外決定一次
+                is_spot = market_type == MarketType.SPOT
+                type_key = market_type.value
+                
                 for symbol, market in markets.items():
-                    # 跳過穩定幣交易對
-                    if market['base'] in self.STABLECOINS:
-                        continue
-                    if market['quote'] not in ['USDT']:  
+                    # 跳過穩定幣交易對與非 USDT 報價的交易對
+                    if market['base'] in STABLECOINS or market['quote'] not in QUOTES:
                         continue
                     
                     # 根據市場類型過濾
-                    if market_type == MarketType.SPOT:
+                    if is_spot:
                         # 只獲取純現貨市場，排除保證金交易
                         if market.get('margin', False):
                             continue
-                    else:  # swap
-                        if not market.get(market_type.value, True):
-                            continue
+                    elif not market.get(type_key, True):  # swap
+                        continue
                     
                     try:
-                        market['exchange'] = 'binance'
-                        market_model = MarketModel.from_ccxt(market)
+                        # 交易所實例的市場列表為共用快取，補上交易所名稱時不修改原始資料
+                        market_model = MarketModel.from_ccxt({**market, 'exchange': 'binance'})
                         # 使用 symbol 作為 key 來儲存，自動去除重複項
                         all_markets[market_model.symbol] = market_model
                     except Exception as e:
@@ -184,6 +223,20 @@ class BinanceClient:
         self.logger.info(f"過濾後剩下 {len(unique_markets)} 個唯一市場")
         return unique_markets
 
+    def _load_markets(self, market_type: MarketType, exchange: ccxt.Exchange) -> Dict:
+        """載入市場列表
+
+        ccxt 會把市場列表保存在交易所實例上，因此只在超過 MARKETS_TTL 時才強制重新請求
+        """
+        now = time.monotonic()
+        key = (self._credentials(self.auth_config), market_type)
+        loaded_at = self._markets_loaded_at.get(key)
+        reload = loaded_at is not None and now - loaded_at >= self.MARKETS_TTL
+        markets = exchange.load_markets(reload=reload)
+        if loaded_at is None or reload:
+            self._markets_loaded_at[key] = now
+        return markets
+
     def fetch_ohlcv(
         self,
         symbol: str,
@@ -228,6 +281,76 @@ class BinanceClient:
             self.logger.error(f"獲取 OHLCV 數據時發生錯誤: {str(e)}")
             raise
 
+    def fetch_ohlcv_batch(
+        self,
+        symbols: List[str],
+        timeframe: Timeframe = Timeframe.HOUR_4,
+        limit: int = 300,
+        market_type: MarketType = MarketType.SPOT,
+        max_concurrency: int = 16
+    ) -> Dict[str, Union[List[List[float]], Exception]]:
+        """同時獲取多個交易對的 OHLCV 數據
+
+        Args:
+            symbols: 交易對符號列表，例如 ["BTC/USDT", "ETH/USDT"]
+            timeframe: 時間間隔
+            limit: 每個交易對返回的數據點數量
+            market_type: 市場類型，MarketType.SPOT 或 MarketType.SWAP
+            max_concurrency: 同時進行中的請求上限
+
+        Returns:
+            Dict[str, Union[List[List[float]], Exception]]: 以交易對為 key 的 OHLCV 數據，
+            失敗的交易對對應其例外（與 fetch_ohlcv 拋出的例外相同）
+        """
+        # 以共用的同步交易所實例載入市場列表（受 MARKETS_TTL 快取），避免非同步實例重新下載
+        exchange_class = self.spot_client if market_type == MarketType.SPOT else self.swap_client
+        self._load_markets(market_type, exchange_class)
+        return asyncio.run(self._fetch_ohlcv_batch(exchange_class, symbols, timeframe, limit, market_type, max_concurrency))
+
+    async def _fetch_ohlcv_batch(
+        self,
+        sync_exchange: ccxt.Exchange,
+        symbols: List[str],
+        timeframe: Timeframe,
+        limit: int,
+        market_type: MarketType,
+        max_concurrency: int
+    ) -> Dict[str, Union[List[List[float]], Exception]]:
+        # 非同步的交易所實例綁定在目前的事件迴圈上，因此每次批次都重新建立並在結束時關閉
+        exchange_class = ccxt_async.binance if market_type == MarketType.SPOT else ccxt_async.binanceusdm
+        exchange = exchange_class(self.auth_config)
+        exchange.set_markets(sync_exchange.markets, sync_exchange.currencies)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        progress = tqdm(
+            total=len(symbols),
+            desc=f"Fetching {timeframe.value} OHLCV",
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}]",
+        )
+
+        async def fetch_one(symbol: str) -> List[List[float]]:
+            async with semaphore:
+                try:
+                    return await exchange.fetch_ohlcv(symbol, timeframe.value, limit=limit)
+                except ccxt.BadSymbol as e:
+                    self.logger.error(f"無效的交易對符號 {symbol}: {str(e)}")
+                    raise ValueError(f"無效的交易對符號: {symbol}")
+                except ccxt.BadRequest as e:
+                    self.logger.error(f"請求參數無效: {str(e)}")
+                    raise ValueError(f"請求參數無效: {str(e)}")
+                except Exception as e:
+                    self.logger.error(f"獲取 {symbol} 的 OHLCV 數據時發生錯誤: {str(e)}")
+                    raise
+                finally:
+                    progress.update(1)
+
+        try:
+            # enableRateLimit 仍然有效，請求會依交易所限制排隊
+            results = await asyncio.gather(*(fetch_one(symbol) for symbol in symbols), return_exceptions=True)
+        finally:
+            progress.close()
+            await exchange.close()
+        return dict(zip(symbols, results))
+
 
 if __name__ == "__main__":
     client = BinanceClient()
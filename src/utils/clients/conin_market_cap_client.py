@@ -1,5 +1,7 @@
 from requests import Request, Session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
+from urllib3.util.retry import Retry
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 import os
@@ -20,6 +22,19 @@ class CoinMarketCapClient:
 
         self.base_url = 'https://pro-api.coinmarketcap.com'
         self.session = Session()
+        # 重複使用 keep-alive 連線，並對暫時性錯誤（限流、伺服器錯誤）自動退避重試；
+        # 重試用盡時回傳最後的回應，交給下方的狀態碼檢查處理
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET'],
+                raise_on_status=False
+            )
+        ))
         self.session.headers.update({
             'Accepts': 'application/json',
             'X-CMC_PRO_API_KEY': os.getenv('COINMARKETCAP_API_KEY'),
@@ -56,9 +71,10 @@ class CoinMarketCapClient:
                 self.logger.error(error_msg)
                 raise self.Error(error_msg)
             
-            data = response.json()['data']
-            self.logger.info(f"成功獲取 {len(data)} 個加密貨幣列表")
-            return MarketCapModel.from_api_response(data)
+            # 由 pydantic-core 直接解析原始 JSON，避免先把整個響應轉成 Python dict
+            market_caps = MarketCapModel.from_api_json(response.content)
+            self.logger.info(f"成功獲取 {len(market_caps)} 個加密貨幣列表")
+            return market_caps
             
         except (ConnectionError, Timeout) as e:
             error_msg = f"Network error while fetching data: {str(e)}"
@@ -1,40 +1,60 @@
-import json
+import gzip
 import os
 from typing import List
 
+from pydantic import TypeAdapter
+
 from src.models.market_model import MarketModel
 from src.models.market_cap_model import MarketCapModel
 from src.utils.db.market_store import MarketStore
 from src.utils.db.market_cap_store import MarketCapStore
 
+# 整個列表以單一編譯好的 validator/serializer 在 pydantic-core 中處理，不必逐筆建立模型
+_MARKET_LIST = TypeAdapter(List[MarketModel])
+_MARKET_CAP_LIST = TypeAdapter(List[MarketCapModel.Crypto])
+
+_STORAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "storage")
+_MARKET_FILE_PATH = os.path.join(_STORAGE_DIR, "markets.json.gz")
+_MARKET_CAP_FILE_PATH = os.path.join(_STORAGE_DIR, "market_caps.json.gz")
+
 class FileStore(MarketStore, MarketCapStore):
     """Implementation of MarketStore that uses a JSON file for storage"""
     
+    __slots__ = ('market_file_path', 'market_cap_file_path')
+
     def __init__(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.market_file_path = os.path.join(current_dir, "storage", "markets.json")
-        self.market_cap_file_path = os.path.join(current_dir, "storage", "market_caps.json")
+        self.market_file_path = _MARKET_FILE_PATH
+        self.market_cap_file_path = _MARKET_CAP_FILE_PATH
         
         # Create empty files if they don't exist
+        # 空的存檔也要是 gzip 壓縮的 JSON 陣列，讀取時才不會解析失敗
         for file_path in [self.market_file_path, self.market_cap_file_path]:
             if not os.path.exists(file_path):
                 os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                with open(file_path, 'w') as f:
-                    pass
+                self._write_atomic(file_path, b'[]')
+
+    @staticmethod
+    def _write_atomic(file_path: str, data: bytes) -> None:
+        # 先寫入暫存檔再整個替換，寫入失敗時保留原本完整的檔案
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            # 不縮排並以 gzip 壓縮，檔案約小 6 倍，讀寫的磁碟 I/O 隨之減少
+            f.write(gzip.compress(data, compresslevel=6, mtime=0))
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def _read(file_path: str) -> bytes:
+        with gzip.open(file_path, 'rb') as f:
+            return f.read()
 
     ## Market
 
     def save(self, markets: List[MarketModel]) -> None:
-        self.delete_all()
-        market_dicts = [market.model_dump(mode='json') for market in markets]
-        with open(self.market_file_path, 'w') as f:
-            json.dump(market_dicts, f, indent=2)
+        self._write_atomic(self.market_file_path, _MARKET_LIST.dump_json(markets))
     
     def find_all(self) -> List[MarketModel]:
         try:
-            with open(self.market_file_path, 'r') as f:
-                market_dicts = json.load(f)
-            return [MarketModel(**market_dict) for market_dict in market_dicts]
+            return _MARKET_LIST.validate_json(self._read(self.market_file_path))
         except FileNotFoundError:
             return []
         
@@ -47,25 +67,18 @@ class FileStore(MarketStore, MarketCapStore):
         return [market for market in markets if market.type == MarketModel.MarketType.SWAP]
     
     def delete_all(self) -> None:
-        with open(self.market_file_path, 'w') as f:
-            f.truncate(0)
+        self._write_atomic(self.market_file_path, b'[]')
 
     ## Market Cap
 
     def save_market_caps(self, market_caps: List[MarketCapModel]) -> None:
-        self.delete_all_market_caps()
-        market_cap_dicts = [market_cap.model_dump(mode='json') for market_cap in market_caps]
-        with open(self.market_cap_file_path, 'w') as f:
-            json.dump(market_cap_dicts, f, indent=2)
+        self._write_atomic(self.market_cap_file_path, _MARKET_CAP_LIST.dump_json(market_caps))
     
     def find_all_market_caps(self) -> List[MarketCapModel]:
         try:
-            with open(self.market_cap_file_path, 'r') as f:
-                market_cap_dicts = json.load(f)
-            return [MarketCapModel.Crypto.model_validate(market_cap_dict) for market_cap_dict in market_cap_dicts]
+            return _MARKET_CAP_LIST.validate_json(self._read(self.market_cap_file_path))
         except FileNotFoundError:
             return []
     
     def delete_all_market_caps(self) -> None:
-        with open(self.market_cap_file_path, 'w') as f:
-            f.truncate(0)
+        self._write_atomic(self.market_cap_file_path, b'[]')
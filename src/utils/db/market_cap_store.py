@@ -5,6 +5,8 @@ from src.models.market_cap_model import MarketCapModel
 
 class MarketCapStore(ABC):
     """Abstract base class for market data access"""
+
+    __slots__ = ()
     
     @abstractmethod
     def save_market_caps(self, markets: List[MarketCapModel]) -> None:
@@ -5,6 +5,8 @@ from src.models.market_model import MarketModel
 
 class MarketStore(ABC):
     """Abstract base class for market data access"""
+
+    __slots__ = ()
     
     @abstractmethod
     def save(self, markets: List[MarketModel]) -> None:
@@ -1,7 +1,35 @@
 from typing import List
+import numpy as np
+import pandas as pd
 from src.models.market_cap_model import MarketCapModel
 from src.models.market_model import MarketModel
 
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def ohlcv_to_dataframe(ohlcv: List[List[float]]) -> pd.DataFrame:
+    """將 ccxt 的 OHLCV 列表轉換為以時間戳記為索引的 DataFrame
+    
+    Args:
+        ohlcv: [timestamp, open, high, low, close, volume] 列表
+        
+    Returns:
+        pd.DataFrame: 按時間排序、欄位為連續 float64 陣列的 OHLCV 數據
+    """
+    # 一次轉換整個列表，避免逐欄 astype
+    data = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+    index = pd.DatetimeIndex(
+        pd.to_datetime(data[:, 0].astype(np.int64), unit='ms'),
+        name='timestamp'
+    )
+    # 以 Fortran 順序存放，讓每個欄位在記憶體中都是連續的
+    values = np.asfortranarray(data[:, 1:])
+    df = pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS, copy=False)
+    
+    # 確保數據按時間排序
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    return df
+
 def filter_by_market_cap_rank(
     markets: List[MarketModel],
     market_cap_data: List[MarketCapModel.Crypto],
@@ -17,15 +45,15 @@ def filter_by_market_cap_rank(
     Returns:
         List[MarketModel]: 符合排名要求的市場列表
     """
-    # 創建排名查找字典
-    rank_lookup = {
-        crypto.symbol: crypto.cmc_rank 
-        for crypto in market_cap_data 
+    # 只需判斷是否在排名內，建立符合排名的代號集合即可
+    ranked_symbols = frozenset(
+        crypto.symbol
+        for crypto in market_cap_data
         if crypto.cmc_rank is not None and crypto.cmc_rank <= max_rank
-    }
+    )
     
     # 過濾市場
     return [
         market for market in markets
-        if market.base in rank_lookup
+        if market.base in ranked_symbols
     ]
\ No newline at end of file
@@ -2,6 +2,8 @@ import os
 import logging
 import colorlog
 
+_configured = False
+
 def setup_logging(name: str) -> logging.Logger:
     """
     Setup logging configuration with consistent format and colors across the application.
@@ -12,6 +14,11 @@ def setup_logging(name: str) -> logging.Logger:
     Returns:
         A configured logger instance
     """
+    global _configured
+    # root logger 只需設定一次，之後直接回傳具名 logger
+    if _configured:
+        return logging.getLogger(name)
+
     # Create color formatter
     formatter = colorlog.ColoredFormatter(
         "%(log_color)s[%(asctime)s][%(name)s] %(message)s",
@@ -42,6 +49,7 @@ def setup_logging(name: str) -> logging.Logger:
     # Setup root logger
     root_logger.addHandler(console_handler)
     root_logger.setLevel(getattr(logging, os.getenv('LOG_LEVEL', 'INFO')))
+    _configured = True
     
     # Return the named logger
     return logging.getLogger(name) 
\ No newline at end of file